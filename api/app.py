@@ -5,8 +5,11 @@
 
 from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -15,16 +18,20 @@ from dotenv import load_dotenv
 
 # 匯入 MongoDB 相關模組
 from db.database_mongodb import init_mongodb, close_mongodb, get_mongodb_connection
-from db.news_mongodb import get_news_mongo_db
+from db.news_mongodb import get_news_mongo_db, SORT_MAP
+
+# 匯入回應快取
+from .cache import cached
 
 # 匯入分離的排程器
-from .scheduler import start_scheduler, stop_scheduler, get_scheduler_status, get_scheduler_interval, run_scraper_job
+from .scheduler import start_scheduler, stop_scheduler, get_scheduler_status, get_scheduler_interval, run_scraper_job, stop_scheduler_logging
 
 # 載入環境變數
 load_dotenv()
 
 # 設定日誌
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
 
 LOG_DIR = Path("logs")
@@ -32,34 +39,39 @@ LOG_DIR.mkdir(exist_ok=True)
 
 logger = logging.getLogger("news_api")
 logger.setLevel(logging.INFO)
-
-# 清除現有的 handlers
-for handler in logger.handlers[:]:
-    logger.removeHandler(handler)
-
-# 設定格式
-formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-# 時間輪轉文件處理器
-file_handler = TimedRotatingFileHandler(
-    filename=LOG_DIR / "api.log",
-    when='midnight',
-    interval=1,
-    backupCount=7,
-    encoding='utf-8'
-)
-file_handler.setFormatter(formatter)
-file_handler.suffix = "%Y%m%d"
-
-# 控制台處理器
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-
-# 添加處理器
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+logger.propagate = False
+
+# 背景寫入日誌的監聽器，於應用關閉時停止
+log_listener: Optional[QueueListener] = None
+
+# 已設定過（例如 --reload 重新載入模組）時不重複添加處理器，避免每筆日誌重複寫入
+if not logger.handlers:
+    # 設定格式
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    # 時間輪轉文件處理器
+    file_handler = TimedRotatingFileHandler(
+        filename=LOG_DIR / "api.log",
+        when='midnight',
+        interval=1,
+        backupCount=7,
+        encoding='utf-8',
+        delay=True  # 第一筆日誌寫入時才開啟檔案
+    )
+    file_handler.setFormatter(formatter)
+    file_handler.suffix = "%Y%m%d"
+
+    # 控制台處理器
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    # 請求路徑上只做佇列寫入，檔案與控制台輸出交由背景執行緒處理
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    log_listener.start()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -77,10 +89,13 @@ async def lifespan(app: FastAPI):
         logger.error(f"MongoDB 初始化失敗: {e}")
         raise
     
-    # 啟動排程器
+    # 啟動排程器（多 worker 時只有取得排程器鎖的 worker 會啟動）
     interval = get_scheduler_interval()
-    await start_scheduler(interval)
-    logger.info(f"📅 排程器已啟動 - 每 {interval} 小時執行爬蟲")
+    if await start_scheduler(interval):
+        logger.info(f"📅 排程器已啟動 - 每 {interval} 小時執行爬蟲")
+        
+        # 索引維護（建立與移除索引）只由排程器所在的 worker 執行一次
+        await run_in_threadpool(get_news_mongo_db().ensure_indexes)
     
     yield
     
@@ -88,21 +103,33 @@ async def lifespan(app: FastAPI):
     logger.info("👋 正在關閉新聞 API 服務")
     await stop_scheduler()
     close_mongodb()
+    
+    # 停止日誌監聽器，確保佇列中的日誌寫入完畢
+    global log_listener
+    stop_scheduler_logging()
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
 
 app = FastAPI(
     title="新聞 API with Scheduler (MongoDB)",
     description="提供新聞數據的 RESTful API，內建自動爬蟲排程 (使用 MongoDB)",
     version="2.0.0-mongodb",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # 添加 CORS 中間件，支持前端跨域請求
+# CORS_ORIGINS 為逗號分隔的允許來源；未設定時允許所有來源，但不允許攜帶憑證
+cors_origins = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # 生產環境中應該指定具體的域名
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=cors_origins,
+    allow_origin_regex=None,
+    allow_credentials="*" not in cors_origins,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    expose_headers=["ETag"],
 )
 
 # MongoDB 依賴注入
@@ -113,6 +140,28 @@ def get_mongo_db():
         raise HTTPException(status_code=503, detail="MongoDB 連接不可用")
     return get_news_mongo_db()
 
+@lru_cache(maxsize=1024)
+def _parse_iso_day(value: str) -> datetime:
+    """解析 YYYY-MM-DD 日期字串（常見日期重複查詢時直接取用快取）"""
+    return datetime.fromisoformat(value)
+
+def parse_date_range(start_date: Optional[str], end_date: Optional[str]):
+    """
+    解析查詢的日期範圍
+    
+    Returns:
+        (開始日期, 結束日期)，未提供者為 None
+        
+    Raises:
+        HTTPException: 日期格式無效
+    """
+    try:
+        start_dt = _parse_iso_day(start_date) if start_date else None
+        end_dt = _parse_iso_day(end_date) if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式錯誤，請使用 YYYY-MM-DD")
+    return start_dt, end_dt
+
 # Pydantic 模型
 class NewsResponse(BaseModel):
     pk: str  # MongoDB ObjectId 作為字串
@@ -125,12 +174,18 @@ class NewsResponse(BaseModel):
     create_time: Optional[datetime] = None
 
 class NewsListResponse(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None  # 游標分頁時不計算總數
+    page: Optional[int] = None
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None
     data: List[NewsResponse]
 
+class NewsCountResponse(BaseModel):
+    total: int
+    estimated: bool
+
 class StatsResponse(BaseModel):
     total_news: int
     sources: Dict[str, int]
@@ -142,6 +197,30 @@ class SchedulerStatusResponse(BaseModel):
     next_run: Optional[datetime] = None
     last_run: Optional[datetime] = None
 
+def parse_create_time(value: Any) -> Optional[datetime]:
+    """解析資料層回傳的 create_time (ISO 字串或 datetime)"""
+    if not value:
+        return None
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def build_news_response(news_dict: Dict[str, Any]) -> NewsResponse:
+    """以 model_construct 建立列表用的 NewsResponse，略過對資料庫資料的重複驗證"""
+    return NewsResponse.model_construct(
+        pk=news_dict.get('pk', ''),
+        news_id=news_dict.get('news_id', ''),
+        news_source=news_dict.get('news_source', ''),
+        author=news_dict.get('author'),
+        title=news_dict.get('title'),
+        url=news_dict.get('url'),
+        publish_time=news_dict.get('publish_time'),
+        create_time=parse_create_time(news_dict.get('create_time'))
+    )
+
 # API 路由
 @app.get("/")
 async def root():
@@ -170,7 +249,7 @@ async def health_check():
         scheduler_status = get_scheduler_status()
         
         # 獲取 MongoDB 資料庫資訊
-        db_info = connection.get_database_info()
+        db_info = await run_in_threadpool(connection.get_database_info)
         
         return {
             "status": "healthy",
@@ -230,6 +309,7 @@ async def get_scheduler_status_api():
         raise HTTPException(status_code=500, detail="無法獲取排程器狀態")
 
 @app.get("/news", response_model=NewsListResponse)
+@cached(expire=30)
 async def get_news(
     page: int = Query(1, ge=1, description="頁碼"),
     per_page: int = Query(20, ge=1, le=100, description="每頁數量"),
@@ -240,74 +320,95 @@ async def get_news(
     end_date: Optional[str] = Query(None, description="結束日期 (YYYY-MM-DD)"),
     sort_by: str = Query("create_time", description="排序欄位 (create_time, publish_time, title)"),
     sort_order: str = Query("desc", description="排序方向 (asc, desc)"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor)，僅支援 create_time 倒序"),
     mongo_db = Depends(get_mongo_db)
 ):
     """獲取新聞列表 - 支持搜尋、過濾和排序功能
     
     主要功能：
     - 獲取新聞列表（分頁）
+    - 游標分頁（使用 cursor 參數，不計算總數，深頁查詢效能穩定）
     - 標題關鍵字搜尋（使用 search 參數）
     - 多維度過濾（來源、作者、日期範圍）
     - 靈活排序
     """
+    if (sort_by, sort_order.lower()) not in SORT_MAP:
+        raise HTTPException(status_code=400, detail=f"不支援的排序方式: {sort_by} {sort_order}")
+    if cursor is not None and (sort_by, sort_order.lower()) != ("create_time", "desc"):
+        raise HTTPException(status_code=400, detail="游標分頁僅支援 create_time 倒序排序")
+
+    start_dt, end_dt = parse_date_range(start_date, end_date)
+
     try:
         # 使用 MongoDB 查詢
-        result = mongo_db.get_news_by_query(
+        result = await run_in_threadpool(
+            mongo_db.get_news_by_query,
             page=page,
             per_page=per_page,
             news_source=source,
             search=search,
             author=author,
-            start_date=start_date,
-            end_date=end_date,
+            start_date=start_dt,
+            end_date=end_dt,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            cursor=cursor
         )
         
-        # 轉換為響應模型
-        news_data = []
-        for news_dict in result['data']:
-            # 解析 create_time 字串為 datetime 對象
-            create_time = None
-            if news_dict.get('create_time'):
-                try:
-                    if isinstance(news_dict['create_time'], str):
-                        create_time = datetime.fromisoformat(news_dict['create_time'].replace('Z', '+00:00'))
-                    else:
-                        create_time = news_dict['create_time']
-                except:
-                    create_time = None
-            
-            news_item = NewsResponse(
-                pk=news_dict.get('pk', ''),
-                news_id=news_dict.get('news_id', ''),
-                news_source=news_dict.get('news_source', ''),
-                author=news_dict.get('author'),
-                title=news_dict.get('title'),
-                url=news_dict.get('url'),
-                publish_time=news_dict.get('publish_time'),
-                create_time=create_time
-            )
-            news_data.append(news_item)
+        # 轉換為響應模型 (資料來自資料庫，型別已確定，略過逐筆驗證)
+        news_data = [build_news_response(news_dict) for news_dict in result['data']]
         
-        return NewsListResponse(
+        return NewsListResponse.model_construct(
             total=result['total'],
             page=result['page'],
             per_page=result['per_page'],
             pages=result['pages'],
+            has_next=result['has_next'],
+            next_cursor=result['next_cursor'],
             data=news_data
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"獲取新聞列表失敗: {e}")
         raise HTTPException(status_code=500, detail="獲取新聞列表失敗")
 
+@app.get("/news/count", response_model=NewsCountResponse)
+@cached(expire=30)
+async def get_news_count(
+    source: Optional[str] = Query(None, description="新聞來源過濾"),
+    search: Optional[str] = Query(None, description="標題搜尋關鍵字"),
+    author: Optional[str] = Query(None, description="作者過濾"),
+    start_date: Optional[str] = Query(None, description="開始日期 (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="結束日期 (YYYY-MM-DD)"),
+    mongo_db = Depends(get_mongo_db)
+):
+    """獲取新聞數量 - 無過濾條件時回傳估算值"""
+    start_dt, end_dt = parse_date_range(start_date, end_date)
+
+    try:
+        result = await run_in_threadpool(
+            mongo_db.count_news,
+            news_source=source,
+            search=search,
+            author=author,
+            start_date=start_dt,
+            end_date=end_dt
+        )
+        return NewsCountResponse(total=result['total'], estimated=result['estimated'])
+        
+    except Exception as e:
+        logger.error(f"獲取新聞數量失敗: {e}")
+        raise HTTPException(status_code=500, detail="獲取新聞數量失敗")
+
 @app.get("/stats", response_model=StatsResponse)
+@cached(expire=300)
 async def get_stats(mongo_db = Depends(get_mongo_db)):
     """獲取統計信息"""
     try:
         # 使用 MongoDB 獲取統計資訊
-        stats = mongo_db.get_stats()
+        stats = await run_in_threadpool(mongo_db.get_stats)
         
         return StatsResponse(
             total_news=stats['total_news'],
@@ -320,6 +421,7 @@ async def get_stats(mongo_db = Depends(get_mongo_db)):
         raise HTTPException(status_code=500, detail="獲取統計信息失敗")
 
 @app.get("/news/recent")
+@cached(expire=60)
 async def get_recent_news(
     limit: int = Query(10, ge=1, le=50, description="返回數量"),
     source: Optional[str] = Query(None, description="新聞來源過濾"),
@@ -327,10 +429,14 @@ async def get_recent_news(
     mongo_db = Depends(get_mongo_db)
 ):
     """獲取最新新聞"""
+    if (sort_by, "desc") not in SORT_MAP:
+        raise HTTPException(status_code=400, detail=f"不支援的排序欄位: {sort_by}")
+
     try:
         # 如果有來源過濾，使用查詢功能
         if source:
-            result = mongo_db.get_news_by_query(
+            result = await run_in_threadpool(
+                mongo_db.get_news_by_query,
                 page=1,
                 per_page=limit,
                 news_source=source,
@@ -340,32 +446,10 @@ async def get_recent_news(
             news_data = result['data']
         else:
             # 直接獲取最新新聞
-            news_data = mongo_db.get_recent_news(limit)
+            news_data = await run_in_threadpool(mongo_db.get_recent_news, limit)
         
         # 轉換格式以符合原 API 響應
-        formatted_data = []
-        for news_dict in news_data:
-            # 解析 create_time
-            create_time = None
-            if news_dict.get('create_time'):
-                try:
-                    if isinstance(news_dict['create_time'], str):
-                        create_time = datetime.fromisoformat(news_dict['create_time'].replace('Z', '+00:00'))
-                    else:
-                        create_time = news_dict['create_time']
-                except:
-                    create_time = None
-            
-            formatted_data.append({
-                "pk": news_dict.get('pk', ''),
-                "news_id": news_dict.get('news_id', ''),
-                "title": news_dict.get('title', ''),
-                "url": news_dict.get('url', ''),
-                "news_source": news_dict.get('news_source', ''),
-                "author": news_dict.get('author', ''),
-                "publish_time": news_dict.get('publish_time'),
-                "create_time": create_time
-            })
+        formatted_data = [build_news_response(news_dict) for news_dict in news_data]
         
         return {
             "count": len(formatted_data),
@@ -377,10 +461,11 @@ async def get_recent_news(
         raise HTTPException(status_code=500, detail="獲取最新新聞失敗")
 
 @app.get("/news/sources")
+@cached(expire=3600)
 async def get_news_sources(mongo_db = Depends(get_mongo_db)):
     """獲取所有新聞來源列表"""
     try:
-        sources_data = mongo_db.get_news_count_by_source()
+        sources_data = await run_in_threadpool(mongo_db.get_news_count_by_source)
         sources = []
         
         for source_name, count in sources_data:
@@ -414,7 +499,6 @@ async def get_news_detail(
     """獲取單條新聞詳情"""
     try:
         from bson import ObjectId
-        from db.models_mongodb import News
         
         # 驗證 ObjectId 格式
         try:
@@ -423,21 +507,13 @@ async def get_news_detail(
             raise HTTPException(status_code=400, detail="無效的新聞ID格式")
         
         # 根據 ObjectId 查找
-        news = News.objects(id=obj_id).first()
-        if not news:
+        news_dict = await run_in_threadpool(mongo_db.get_news_by_pk, obj_id)
+        if not news_dict:
             raise HTTPException(status_code=404, detail="新聞未找到")
         
-        news_dict = news.to_dict()
-        create_time = None
-        if news_dict.get('create_time'):
-            try:
-                if isinstance(news_dict['create_time'], str):
-                    create_time = datetime.fromisoformat(news_dict['create_time'].replace('Z', '+00:00'))
-                else:
-                    create_time = news_dict['create_time']
-            except:
-                create_time = None
+        create_time = parse_create_time(news_dict.get('create_time'))
         
+        # 單筆查詢保留完整驗證
         return NewsResponse(
             pk=news_dict.get('pk', ''),
             news_id=news_dict.get('news_id', ''),
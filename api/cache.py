@@ -0,0 +1,119 @@
+"""
+API 回應快取模組
+在行程內以 TTL 快取 GET 回應，並提供 ETag / Cache-Control 標頭
+"""
+
+import functools
+import hashlib
+import inspect
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+class ResponseCache:
+    """以請求路徑 + 查詢字串為鍵的記憶體回應快取"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # key -> (到期時間, 回應內容, ETag)
+        self._entries: Dict[str, Tuple[float, bytes, str]] = {}
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """取得未過期的快取內容，回傳 (回應內容, ETag)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, body, etag = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        return body, etag
+
+    def set(self, key: str, body: bytes, expire: int) -> str:
+        """寫入快取並回傳 ETag"""
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self._entries[key] = (time.monotonic() + expire, body, etag)
+        return etag
+
+    def clear(self):
+        """清除所有快取（爬蟲寫入新資料後呼叫）"""
+        self._entries.clear()
+
+    def _evict(self):
+        """移除過期項目，仍超過上限時移除最早寫入的項目"""
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+
+# 全域回應快取實例
+response_cache = ResponseCache()
+
+
+def _orjson_default(obj: Any) -> Any:
+    """orjson 無法直接序列化的型別 (Pydantic 模型) 轉為基本型別"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"無法序列化的型別: {type(obj).__name__}")
+
+
+def cached(expire: int) -> Callable:
+    """
+    GET 端點回應快取裝飾器
+
+    快取命中時不會執行端點函數；用戶端帶入相同的 If-None-Match 時回傳 304。
+
+    Args:
+        expire: 快取秒數，同時作為 Cache-Control 的 max-age
+
+    Usage:
+        @app.get("/stats")
+        @cached(expire=300)
+        async def get_stats(...):
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        # 額外注入 Request 以取得快取鍵與條件請求標頭
+        parameters.append(
+            inspect.Parameter('_cache_request', inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        )
+
+        @functools.wraps(func)
+        async def wrapper(*args, _cache_request: Request, **kwargs):
+            key = f"{_cache_request.url.path}?{_cache_request.url.query}"
+
+            hit = response_cache.get(key)
+            if hit is None:
+                result = await func(*args, **kwargs)
+                body = orjson.dumps(result, default=_orjson_default)
+                etag = response_cache.set(key, body, expire)
+            else:
+                body, etag = hit
+
+            headers = {
+                'ETag': etag,
+                'Cache-Control': f'public, max-age={expire}'
+            }
+
+            if _cache_request.headers.get('if-none-match') == etag:
+                return Response(status_code=304, headers=headers)
+
+            return Response(content=body, media_type='application/json', headers=headers)
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
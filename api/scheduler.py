@@ -5,56 +5,130 @@
 """
 
 import asyncio
+import atexit
 import logging
 import os
-from datetime import datetime, timedelta
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+import pytz
+
+from config import Config
+
+from .cache import response_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows 無 fcntl，僅支援單一 worker
+    fcntl = None
+
+# 能否以檔案鎖確保多 worker 時只有一個 worker 執行排程器
+SCHEDULER_LOCK_SUPPORTED = fcntl is not None
+
 # 設定日誌
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+# 背景寫入日誌的監聽器，於應用關閉時停止
+scheduler_log_listener: Optional[QueueListener] = None
+
 def setup_scheduler_logger():
     """設定排程器日誌"""
+    global scheduler_log_listener
+    
     logger = logging.getLogger("scheduler")
     logger.setLevel(logging.INFO)
+    logger.propagate = False
     
-    # 清除現有的 handlers
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-    
-    # 設定格式
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # 時間輪轉文件處理器
-    file_handler = TimedRotatingFileHandler(
-        filename=LOG_DIR / "scheduler.log",
-        when='midnight',
-        interval=1,
-        backupCount=7,
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(formatter)
-    file_handler.suffix = "%Y%m%d"
-    
-    # 控制台處理器
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    
-    # 添加處理器
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # 已設定過（例如 --reload 重新載入模組）時不重複添加處理器，避免每筆日誌重複寫入
+    if not logger.handlers:
+        # 設定格式
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        
+        # 時間輪轉文件處理器
+        file_handler = TimedRotatingFileHandler(
+            filename=LOG_DIR / "scheduler.log",
+            when='midnight',
+            interval=1,
+            backupCount=7,
+            encoding='utf-8',
+            delay=True  # 第一筆日誌寫入時才開啟檔案
+        )
+        file_handler.setFormatter(formatter)
+        file_handler.suffix = "%Y%m%d"
+        
+        # 控制台處理器
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        
+        # 呼叫端只做佇列寫入，檔案與控制台輸出交由背景執行緒處理
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        scheduler_log_listener = QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        scheduler_log_listener.start()
+        # 未經 API 生命週期關閉時（例如直接匯入使用），於程式結束時寫出剩餘日誌
+        atexit.register(stop_scheduler_logging)
     
     return logger
 
+def stop_scheduler_logging():
+    """停止排程器日誌監聽器，確保佇列中的日誌寫入完畢"""
+    global scheduler_log_listener
+    if scheduler_log_listener is not None:
+        scheduler_log_listener.stop()
+        scheduler_log_listener = None
+
 # 全域變數
 scheduler_task: Optional[asyncio.Task] = None
 scheduler_logger = setup_scheduler_logger()
 
+# 啟動後延遲執行首次爬蟲，讓 API 先完成啟動並開始接收請求
+INITIAL_RUN_DELAY = 5.0
+_initial_run_handle: Optional[asyncio.TimerHandle] = None
+_initial_run_task: Optional[asyncio.Task] = None
+# 排程器目前執行中的爬蟲任務，關閉時等待其完成
+_scheduled_job_task: Optional[asyncio.Task] = None
+# 關閉時等待進行中爬蟲任務的最長秒數，逾時則不再等待並繼續關閉流程
+SHUTDOWN_JOB_TIMEOUT = 60.0
+
+# 多 worker 部署時只由取得此檔案鎖的行程執行排程器，避免重複爬取
+SCHEDULER_LOCK_FILE = LOG_DIR / "scheduler.lock"
+_scheduler_lock_file = None
+
+# 爬蟲任務專用的執行緒池，不與其他 run_in_executor 呼叫共用預設執行器
+_scraper_executor = ThreadPoolExecutor(
+    max_workers=Config.MAX_CONCURRENT_SCRAPERS,
+    thread_name_prefix="scraper"
+)
+
+# 重複使用的爬蟲管理器（爬蟲以建立當天的台北日期作為「今天」的判斷基準，跨日時重新建立）
+_scraper_manager = None
+_scraper_manager_date: Optional[date] = None
+# 同一時間只執行一個爬蟲任務，避免共用的爬蟲實例狀態互相干擾
+_scraper_lock = threading.Lock()
+
+def _get_scraper_manager():
+    """取得爬蟲管理器，當天已建立時直接重複使用"""
+    global _scraper_manager, _scraper_manager_date
+    
+    today = datetime.now(pytz.timezone('Asia/Taipei')).date()
+    if _scraper_manager is None or _scraper_manager_date != today:
+        from unified_manager_orm import UnifiedScraperManager
+        _scraper_manager = UnifiedScraperManager()
+        _scraper_manager_date = today
+    
+    return _scraper_manager
+
 async def run_scraper_job() -> dict:
     """執行爬蟲任務"""
     try:
@@ -66,15 +140,22 @@ async def run_scraper_job() -> dict:
         # 在新線程中執行爬蟲（避免阻塞 FastAPI）
         def scraper_worker():
             try:
-                from unified_manager_orm import UnifiedScraperManager
-                scraper_manager = UnifiedScraperManager()
-                results = scraper_manager.run_all_scrapers(max_pages=3)
+                with _scraper_lock:
+                    scraper_manager = _get_scraper_manager()
+                    results = scraper_manager.run_all_scrapers(max_pages=3)
                 
                 # 記錄執行結果
                 if '總計' in results:
                     total = results['總計']
                     scheduler_logger.info(f"✅ 爬蟲任務執行成功 - 總計:{total.get('total', 0)}, 新增:{total.get('new', 0)}, 跳過:{total.get('skipped', 0)}, 失敗:{total.get('failed', 0)}")
                 
+                # 更新 /stats 使用的統計快照
+                try:
+                    from db.news_mongodb import get_news_mongo_db
+                    get_news_mongo_db().refresh_stats()
+                except Exception as e:
+                    scheduler_logger.warning(f"⚠️ 更新統計快照失敗: {e}")
+                
                 return results
             except Exception as e:
                 scheduler_logger.error(f"❌ 爬蟲任務執行異常: {e}")
@@ -82,9 +163,12 @@ async def run_scraper_job() -> dict:
                 scheduler_logger.error(f"詳細錯誤: {traceback.format_exc()}")
                 return {"error": str(e)}
         
-        # 在線程池中執行
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, scraper_worker)
+        # 在爬蟲專用線程池中執行
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_scraper_executor, scraper_worker)
+        
+        # 新資料寫入後清除 API 回應快取
+        response_cache.clear()
         
         scheduler_logger.info("=" * 60)
         scheduler_logger.info("排程爬蟲任務結束")
@@ -116,14 +200,23 @@ async def run_scheduler(interval_hours: int = 24):
         # 等待到指定時間
         await asyncio.sleep(wait_seconds)
     
+    global _scheduled_job_task
+    
+    loop = asyncio.get_running_loop()
+    
     while True:
         try:
-            # 執行爬蟲任務
-            await run_scraper_job()
+            # 以絕對截止時間排程，爬蟲執行時間不會累積成排程漂移
+            next_deadline = loop.time() + interval_hours * 3600
+            
+            # 執行爬蟲任務（shield: 排程器被取消時不中斷進行中的爬蟲，由 stop_scheduler 等待其完成）
+            _scheduled_job_task = asyncio.create_task(run_scraper_job())
+            await asyncio.shield(_scheduled_job_task)
+            _scheduled_job_task = None
             
             # 等待下次執行
-            wait_seconds = interval_hours * 3600
-            scheduler_logger.info(f"📅 等待 {interval_hours} 小時後執行下次任務")
+            wait_seconds = max(0, next_deadline - loop.time())
+            scheduler_logger.info(f"📅 等待 {wait_seconds/3600:.1f} 小時後執行下次任務")
             await asyncio.sleep(wait_seconds)
             
         except asyncio.CancelledError:
@@ -134,26 +227,90 @@ async def run_scheduler(interval_hours: int = 24):
             # 等待一段時間後重試
             await asyncio.sleep(300)  # 5分鐘後重試
 
-async def start_scheduler(interval_hours: int = 24) -> asyncio.Task:
-    """啟動排程器"""
-    global scheduler_task
+def _start_initial_run():
+    """建立首次爬蟲任務（由 start_scheduler 延遲呼叫）"""
+    global _initial_run_handle, _initial_run_task
+    
+    _initial_run_handle = None
+    _initial_run_task = asyncio.create_task(run_scraper_job())
+
+def _acquire_scheduler_lock() -> bool:
+    """嘗試取得排程器檔案鎖，已由其他 worker 持有時回傳 False"""
+    global _scheduler_lock_file
+    
+    if fcntl is None or _scheduler_lock_file is not None:
+        return True
+    
+    lock_file = open(SCHEDULER_LOCK_FILE, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    # 行程結束時作業系統會自動釋放鎖
+    _scheduler_lock_file = lock_file
+    return True
+
+def _release_scheduler_lock():
+    """釋放排程器檔案鎖"""
+    global _scheduler_lock_file
+    
+    if _scheduler_lock_file is not None:
+        fcntl.flock(_scheduler_lock_file, fcntl.LOCK_UN)
+        _scheduler_lock_file.close()
+        _scheduler_lock_file = None
+
+async def start_scheduler(interval_hours: int = 24) -> Optional[asyncio.Task]:
+    """
+    啟動排程器
+    
+    多 worker 部署時只有一個 worker 會啟動排程器，其餘 worker 回傳 None
+    """
+    global scheduler_task, _initial_run_handle
     
     if scheduler_task and not scheduler_task.done():
         scheduler_logger.info("📅 排程器已在運行中")
         return scheduler_task
     
+    if not _acquire_scheduler_lock():
+        scheduler_logger.info("📅 排程器已由其他 worker 執行，本行程僅提供 API")
+        return None
+    
     scheduler_task = asyncio.create_task(run_scheduler(interval_hours))
     scheduler_logger.info(f"📅 排程器已啟動 - 每 {interval_hours} 小時執行爬蟲")
     
-    # 立即執行一次爬蟲任務
-    scheduler_logger.info("🚀 排程器啟動時立即執行一次爬蟲任務")
-    asyncio.create_task(run_scraper_job())
+    # 啟動後執行一次爬蟲任務（延遲數秒，不與 API 啟動及第一批請求爭搶資源）
+    scheduler_logger.info(f"🚀 排程器將於 {INITIAL_RUN_DELAY:.0f} 秒後執行首次爬蟲任務")
+    loop = asyncio.get_running_loop()
+    _initial_run_handle = loop.call_later(INITIAL_RUN_DELAY, _start_initial_run)
     
     return scheduler_task
 
+async def _wait_for_job(task: Optional[asyncio.Task], name: str):
+    """等待進行中的爬蟲任務完成，超過 SHUTDOWN_JOB_TIMEOUT 時放棄等待"""
+    if task is None or task.done():
+        return
+    
+    scheduler_logger.info(f"📅 等待{name}完成（最多 {SHUTDOWN_JOB_TIMEOUT:.0f} 秒）")
+    try:
+        # shield: 逾時時不取消任務本身，爬蟲執行緒無法中途中斷
+        await asyncio.wait_for(asyncio.shield(task), SHUTDOWN_JOB_TIMEOUT)
+    except asyncio.TimeoutError:
+        scheduler_logger.warning(f"⚠️ {name}於 {SHUTDOWN_JOB_TIMEOUT:.0f} 秒內未完成，不再等待")
+
 async def stop_scheduler():
-    """停止排程器"""
-    global scheduler_task
+    """
+    停止排程器
+    
+    進行中的爬蟲任務會等待完成後才返回，避免其後關閉的 MongoDB 連線與日誌仍被使用
+    """
+    global scheduler_task, _initial_run_handle, _initial_run_task, _scheduled_job_task
+    
+    # 首次爬蟲尚未開始時取消
+    if _initial_run_handle:
+        _initial_run_handle.cancel()
+        _initial_run_handle = None
     
     if scheduler_task:
         scheduler_task.cancel()
@@ -162,6 +319,13 @@ async def stop_scheduler():
         except asyncio.CancelledError:
             scheduler_logger.info("📅 排程器已停止")
         scheduler_task = None
+    
+    await _wait_for_job(_scheduled_job_task, "排程爬蟲任務")
+    _scheduled_job_task = None
+    await _wait_for_job(_initial_run_task, "首次爬蟲任務")
+    _initial_run_task = None
+    
+    _release_scheduler_lock()
 
 def get_scheduler_status() -> dict:
     """獲取排程器狀態"""
@@ -175,8 +339,13 @@ def get_scheduler_status() -> dict:
         "task_cancelled": scheduler_task.cancelled() if scheduler_task else False
     }
 
+@lru_cache(maxsize=1)
 def get_scheduler_interval() -> int:
-    """從環境變數獲取排程間隔"""
+    """
+    從環境變數獲取排程間隔
+    
+    結果會被快取；於執行期間修改 SCHEDULER_INTERVAL 後需呼叫 get_scheduler_interval.cache_clear()
+    """
     scheduler_interval_env = os.getenv('SCHEDULER_INTERVAL')
     if scheduler_interval_env:
         try:
@@ -3,6 +3,7 @@
 從 .env 文件讀取配置
 """
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -41,10 +42,21 @@ class Config:
     ENABLE_TVBS = os.getenv('ENABLE_TVBS', 'true').lower() == 'true'
     ENABLE_CHINATIMES = os.getenv('ENABLE_CHINATIMES', 'true').lower() == 'true'
     
+    # 啟用的爬蟲（設定於載入時即固定，只計算一次）
+    ENABLED_SCRAPERS = tuple(
+        name for name, enabled in (
+            ('SETN', ENABLE_SETN),
+            ('LTN', ENABLE_LTN),
+            ('TVBS', ENABLE_TVBS),
+            ('ChinaTimes', ENABLE_CHINATIMES),
+        ) if enabled
+    )
+    
     @classmethod
+    @lru_cache(maxsize=1)
     def get_database_url(cls) -> str:
         """
-        根據設定返回資料庫連接字串
+        根據設定返回資料庫連接字串（設定於載入時即固定，結果只計算一次）
         """
         if cls.DATABASE_TYPE == 'sqlite':
             # 確保使用絕對路徑
@@ -61,16 +73,7 @@ class Config:
         """
         返回啟用的爬蟲列表
         """
-        enabled = []
-        if cls.ENABLE_SETN:
-            enabled.append('SETN')
-        if cls.ENABLE_LTN:
-            enabled.append('LTN')
-        if cls.ENABLE_TVBS:
-            enabled.append('TVBS')
-        if cls.ENABLE_CHINATIMES:
-            enabled.append('ChinaTimes')
-        return enabled
+        return list(cls.ENABLED_SCRAPERS)
     
     @classmethod
     def print_config(cls):
@@ -2,44 +2,60 @@
 資料庫工廠 - 根據配置選擇合適的資料庫實現
 """
 import os
+from functools import lru_cache
 from typing import Any
 
 
+def _load_mongodb() -> Any:
+    from .news_mongodb import get_news_mongo_db
+    print("使用 MongoDB 資料庫")
+    return get_news_mongo_db()
+
+
+def _load_postgresql() -> Any:
+    from .news_orm_db import get_news_orm_db
+    print("使用 PostgreSQL 資料庫")
+    return get_news_orm_db()
+
+
+def _load_sqlite() -> Any:
+    try:
+        from .news_orm_db import get_news_orm_db
+        print("使用 SQLite 資料庫")
+        return get_news_orm_db()
+    except ImportError:
+        print("SQLite 模組未找到")
+        raise ImportError("無法載入資料庫模組")
+
+
 class DatabaseFactory:
     """資料庫工廠類，根據配置創建合適的資料庫實例"""
     
+    # 資料庫類型 -> 載入函數
+    _LOADERS = {
+        'mongodb': _load_mongodb,
+        'postgresql': _load_postgresql,
+        'sqlite': _load_sqlite,
+    }
+    
     @staticmethod
     def create_database():
         """根據環境變數創建資料庫實例"""
         database_type = os.getenv('DATABASE_TYPE', 'postgresql').lower()
         
-        if database_type == 'mongodb':
-            from .news_mongodb import get_news_mongo_db
-            print("使用 MongoDB 資料庫")
-            return get_news_mongo_db()
-        elif database_type == 'postgresql':
-            # 保留原有的 PostgreSQL 支援
-            try:
-                from .news_orm_db import news_orm_db
-                print("使用 PostgreSQL 資料庫")
-                return news_orm_db
-            except ImportError:
-                print("PostgreSQL 模組未找到，回退到 SQLite")
-                from .news_orm_db import news_orm_db
-                return news_orm_db
-        elif database_type == 'sqlite':
-            try:
-                from .news_orm_db import news_orm_db
-                print("使用 SQLite 資料庫")
-                return news_orm_db
-            except ImportError:
-                print("SQLite 模組未找到")
-                raise ImportError("無法載入資料庫模組")
-        else:
+        loader = DatabaseFactory._LOADERS.get(database_type)
+        if loader is None:
             raise ValueError(f"不支援的資料庫類型: {database_type}")
+        
+        return loader()
 
 
 # 全域資料庫實例
+@lru_cache(maxsize=1)
 def get_database():
-    """獲取資料庫實例"""
+    """
+    獲取資料庫實例
+    
+    首次呼叫時依 DATABASE_TYPE 載入並快取，之後直接回傳同一實例
+    """
     return DatabaseFactory.create_database()
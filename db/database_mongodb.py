@@ -55,6 +55,8 @@ class MongoDBConnection:
                 serverSelectionTimeoutMS=5000,  # 5秒連接超時
                 connectTimeoutMS=10000,  # 10秒連接超時
                 socketTimeoutMS=10000,   # 10秒socket超時
+                maxPoolSize=int(os.getenv('MONGODB_MAX_POOL_SIZE', 100)),  # 連接池上限
+                waitQueueTimeoutMS=2000,  # 連接池耗盡時最多等待 2 秒，避免請求無限排隊
             )
             
             # 測試連接
@@ -2,7 +2,7 @@
 SQLAlchemy 資料庫連接設定
 """
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from .models import Base
@@ -17,15 +17,59 @@ except ImportError:
     DATABASE_URL = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'news.db')}"
     print("使用默認SQLite資料庫設定")
 
+# 連接池設定
+if DATABASE_URL.startswith('postgresql'):
+    # PostgreSQL: 放大連接池上限，並以 TCP keepalive 偵測斷線，
+    # 取代每次取出連線時的 pre-ping 往返
+    engine_options = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 40)),
+        'pool_recycle': 1800,
+        'pool_pre_ping': False,
+        # 批量 INSERT 合併為多列 VALUES，UPDATE/DELETE 以 execute_batch 送出
+        'executemany_mode': 'values_plus_batch',
+        'insertmanyvalues_page_size': 1000,
+        'connect_args': {
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 5,
+            'options': '-c jit=off',  # 短查詢不需 JIT 編譯
+        },
+    }
+else:
+    engine_options = {'pool_pre_ping': True}
+
 # 創建引擎
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # 設為 True 可以看到 SQL 查詢
-    pool_pre_ping=True
+    query_cache_size=1200,  # 編譯後 SQL 快取，重複查詢不需重新編譯
+    **engine_options
 )
 
-# 創建 Session 類
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 記憶體資料庫沒有日誌檔與 fsync，不需 WAL / mmap 設定
+if DATABASE_URL.startswith('sqlite') and engine.url.database not in (None, '', ':memory:'):
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        """
+        SQLite 連線設定：WAL 模式讓讀取不被寫入阻擋，
+        synchronous=NORMAL 讓 fsync 只發生在 checkpoint 而非每次 commit
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB 頁面快取
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB 記憶體映射讀取
+        cursor.close()
+
+# 創建 Session 類（整個行程共用同一 engine 與連接池）
+# expire_on_commit=False：commit 後不將物件屬性標記過期，之後讀取不需重新查詢
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# 資料表是否已建立（同一行程只需執行一次 create_all）
+_database_initialized = False
 
 
 def create_tables():
@@ -64,9 +108,15 @@ def get_session() -> Session:
 
 # 初始化資料庫表格
 def init_database():
-    """初始化資料庫"""
+    """初始化資料庫（同一行程內重複呼叫時直接返回）"""
+    global _database_initialized
+    
+    if _database_initialized:
+        return
+    
     try:
         create_tables()
+        _database_initialized = True
         print("資料庫初始化完成")
     except Exception as e:
         print(f"資料庫初始化失敗: {e}")
@@ -1,9 +1,22 @@
 """
 MongoDB 模型定義使用 MongoEngine
 """
-from mongoengine import Document, StringField, DateTimeField
+from mongoengine import Document, StringField, DateTimeField, ListField
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+
+def title_ngrams(text: str) -> List[str]:
+    """
+    將文字切成小寫二元組 (bigram)，供標題關鍵字搜尋使用索引
+    
+    中文標題沒有空白分詞，$text 索引會把整段中文視為一個詞而無法做子字串搜尋；
+    改以二元組多鍵索引先縮小候選範圍，再以正則確認完整關鍵字
+    """
+    grams = set()
+    for chunk in text.lower().split():
+        grams.update(chunk[i:i + 2] for i in range(len(chunk) - 1))
+    return sorted(grams)
 
 
 class News(Document):
@@ -17,14 +30,21 @@ class News(Document):
     url = StringField(help_text='新聞網址')
     publish_time = StringField(max_length=50, help_text='發布時間')
     create_time = DateTimeField(default=datetime.utcnow, help_text='資料建立時間')
+    title_ngrams = ListField(StringField(), help_text='標題二元組 (搜尋索引用)')
     
     # 設定元數據
     meta = {
         'collection': 'news',  # 集合名稱
         'indexes': [
-            'news_source',
-            'news_id',
-            'create_time',
+            # news_source / news_id 不另建單欄索引：查詢皆由下方以 news_source 開頭的
+            # 複合索引支援，避免查詢規劃器誤選單欄索引後再逐筆 FETCH 比對
+            # 時間排序皆以 _id 為次要排序鍵，複合索引需包含 _id 才能由索引提供排序
+            ('-create_time', '-id'),  # 時間排序 + 游標分頁
+            ('news_source', '-create_time', '-id'),  # 來源過濾 + 時間排序
+            ('author', '-create_time'),  # 作者過濾 + 時間排序
+            ('-publish_time', '-id'),  # 依發布時間排序
+            ('title', 'id'),  # 依標題排序
+            'title_ngrams',  # 標題關鍵字搜尋
             {
                 'fields': ('news_source', 'news_id'), 
                 'unique': True
@@ -52,10 +72,58 @@ class News(Document):
             'create_time': self.create_time.isoformat() if self.create_time else None
         }
     
+    @staticmethod
+    def raw_to_dict(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        將 as_pymongo() 取得的原始文件轉換為字典，省去 Document 物件建構
+        
+        欄位與 to_dict 相同，但 create_time 保留 datetime，交由回應序列化處理
+        """
+        return {
+            'pk': str(doc['_id']),
+            'news_id': doc.get('news_id', ''),
+            'news_source': doc.get('news_source', ''),
+            'author': doc.get('author') or '',
+            'title': doc.get('title') or '',
+            'url': doc.get('url') or '',
+            'publish_time': doc.get('publish_time') or '',
+            'create_time': doc.get('create_time')
+        }
+    
     @classmethod
     def exists(cls, news_source: str, news_id: str) -> bool:
-        """檢查新聞是否已存在"""
-        return cls.objects(news_source=news_source, news_id=news_id).first() is not None
+        """檢查新聞是否已存在（由複合唯一索引直接判斷，不取回文件內容）"""
+        return cls._get_collection().count_documents(
+            {'news_source': news_source, 'news_id': news_id}, limit=1
+        ) > 0
+    
+    @classmethod
+    def raw_from_dict(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        從字典建立可直接交給 pymongo 寫入的原始文件，省去 Document 建構與 to_mongo 轉換
+        
+        只檢查必填欄位與長度限制，不符時拋出 ValueError
+        """
+        doc = {
+            'news_id': data.get('news_id') or '',
+            'news_source': data.get('news_source') or '',
+            'author': data.get('author') or '',
+            'title': data.get('title') or '',
+            'url': data.get('url') or '',
+            'publish_time': data.get('publish_time') or '',
+            'create_time': datetime.utcnow()
+        }
+        doc['title_ngrams'] = title_ngrams(doc['title'])
+        
+        for name in ('news_id', 'news_source'):
+            if not doc[name]:
+                raise ValueError(f"缺少必要欄位: {name}")
+        
+        for name, max_length in _MAX_LENGTHS.items():
+            if len(doc[name]) > max_length:
+                raise ValueError(f"欄位 {name} 超過長度上限 {max_length}")
+        
+        return doc
     
     @classmethod
     def create_from_dict(cls, data: Dict[str, Any]) -> 'News':
@@ -66,5 +134,14 @@ class News(Document):
             author=data.get('author', ''),
             title=data.get('title', ''),
             url=data.get('url', ''),
-            publish_time=data.get('publish_time', '')
+            publish_time=data.get('publish_time', ''),
+            title_ngrams=title_ngrams(data.get('title') or '')
         )
+
+
+# 有長度限制的字串欄位 (raw_from_dict 使用)
+_MAX_LENGTHS = {
+    name: field.max_length
+    for name, field in News._fields.items()
+    if getattr(field, 'max_length', None)
+}
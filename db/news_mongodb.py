@@ -1,13 +1,99 @@
 """
 基於 MongoEngine 的新聞資料庫管理類
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
+import base64
 import logging
-from datetime import datetime
+import re
+import time
+from functools import lru_cache
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from .database_mongodb import init_mongodb, get_mongodb_connection
+from .models_mongodb import News, title_ngrams
 
 logger = logging.getLogger(__name__)
 
+# 允許的 (排序欄位, 排序方向) 組合，對應 order_by 參數；每個組合與同方向的 _id 次要排序
+# 皆有 (欄位, _id) 複合索引支援（反向排序以倒序走訪同一索引）
+SORT_MAP = {
+    ('create_time', 'desc'): '-create_time',
+    ('create_time', 'asc'): 'create_time',
+    ('publish_time', 'desc'): '-publish_time',
+    ('publish_time', 'asc'): 'publish_time',
+    ('title', 'asc'): 'title',
+    ('title', 'desc'): '-title',
+}
+DEFAULT_SORT = SORT_MAP[('create_time', 'desc')]
+CURSOR_ORDER = ('-create_time', '-id')
+
+# 頁碼分頁允許跳過的最大筆數；更深的頁面需改用游標分頁，避免 skip 逐筆走訪
+MAX_SKIP_OFFSET = 10000
+
+# 列表查詢只讀取回應需要的欄位，避免日後加入內文等大型欄位時一併傳輸
+LIST_FIELDS = ('news_id', 'news_source', 'author', 'title', 'url', 'publish_time', 'create_time')
+LIST_PROJECTION = {field: 1 for field in LIST_FIELDS}
+
+# 批量插入時每次 insert_many 的文件數
+INSERT_BATCH_SIZE = 1000
+
+# 已由複合索引取代的舊索引，ensure_indexes 時移除
+OBSOLETE_INDEXES = (
+    'news_source_1',
+    'news_id_1',
+    'create_time_1',
+    'create_time_-1',
+    'news_source_1_create_time_-1',
+    'publish_time_1',
+    'publish_time_-1',
+    'title_1',
+)
+
+# 新聞數量快取秒數（寫入新聞時立即失效）
+COUNT_CACHE_TTL = 30
+COUNT_CACHE_MAX_ENTRIES = 256
+
+# title_ngrams 回填尚未完成時，重新檢查的間隔秒數
+NGRAMS_READY_RECHECK = 60
+
+# 統計快照存放的集合與文件 ID
+STATS_COLLECTION = 'news_stats'
+STATS_DOC_ID = 'summary'
+
+
+@lru_cache(maxsize=256)
+def _compile_ci_pattern(term: str) -> re.Pattern:
+    """編譯不區分大小寫的字面比對正則，相同關鍵字重複查詢時直接取用快取"""
+    return re.compile(re.escape(term), re.IGNORECASE)
+
+
+def _with_tiebreaker(sort_field: str) -> Tuple[str, str]:
+    """在排序欄位後加上同方向的 _id 次要排序，方向一致時可直接走訪 (欄位, _id) 索引"""
+    return sort_field, '-id' if sort_field.startswith('-') else 'id'
+
+
+def encode_cursor(create_time: datetime, pk: Any) -> str:
+    """將 (create_time, _id) 編碼為分頁游標"""
+    raw = f"{create_time.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    解碼分頁游標
+
+    Raises:
+        ValueError: 游標格式無效
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        create_time_str, pk = raw.split('|', 1)
+        return datetime.fromisoformat(create_time_str), ObjectId(pk)
+    except Exception as e:
+        raise ValueError(f"無效的分頁游標: {cursor}") from e
+
 
 class NewsMongoDatabase:
     """使用 MongoDB 的新聞資料庫管理類"""
@@ -17,6 +103,108 @@ class NewsMongoDatabase:
         self.connected = init_mongodb()
         if not self.connected:
             raise ConnectionError("無法連接到 MongoDB")
+        
+        # 計數快取: 查詢條件 -> (到期時間, 結果)
+        self._count_cache: Dict[tuple, Tuple[float, Any]] = {}
+        
+        # 所有文件皆已有 title_ngrams 時才以二元組索引搜尋標題；未完成時定期重新檢查
+        self._ngrams_ready = False
+        self._ngrams_next_check = 0.0
+    
+    def _get_cached_count(self, key: tuple) -> Optional[Any]:
+        """取得未過期的計數快取"""
+        entry = self._count_cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+    
+    def _set_cached_count(self, key: tuple, value: Any):
+        """寫入計數快取"""
+        if len(self._count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            self._count_cache.clear()
+        self._count_cache[key] = (time.monotonic() + COUNT_CACHE_TTL, value)
+    
+    def invalidate_count_cache(self):
+        """清除計數快取（寫入新聞後呼叫）"""
+        self._count_cache.clear()
+    
+    def _title_ngrams_ready(self) -> bool:
+        """確認 title_ngrams 回填已完成（完成後不再檢查，未完成時每 NGRAMS_READY_RECHECK 秒檢查一次）"""
+        if self._ngrams_ready:
+            return True
+        
+        now = time.monotonic()
+        if now < self._ngrams_next_check:
+            return False
+        self._ngrams_next_check = now + NGRAMS_READY_RECHECK
+        
+        try:
+            missing = News._get_collection().find_one(
+                {'title_ngrams': {'$exists': False}}, {'_id': 1}
+            )
+        except Exception as e:
+            logger.warning(f"檢查標題二元組回填狀態失敗: {e}")
+            return False
+        
+        self._ngrams_ready = missing is None
+        if not self._ngrams_ready:
+            logger.warning("尚有新聞未建立標題二元組，標題搜尋暫以正則比對；請執行 python3 db_manager.py backfill-ngrams")
+        return self._ngrams_ready
+    
+    def ensure_indexes(self) -> bool:
+        """
+        依模型定義建立索引並移除已被取代的舊索引（已存在的索引不會重建，可重複呼叫）
+        
+        Returns:
+            bool: 成功返回 True
+        """
+        try:
+            News.ensure_indexes()
+            
+            collection = News._get_collection()
+            existing = collection.index_information()
+            for name in OBSOLETE_INDEXES:
+                if name in existing:
+                    collection.drop_index(name)
+                    logger.info(f"已移除舊索引: {name}")
+            
+            logger.info("MongoDB 索引確認完成")
+            return True
+        except Exception as e:
+            logger.error(f"建立 MongoDB 索引失敗: {e}")
+            return False
+    
+    def backfill_title_ngrams(self) -> int:
+        """
+        為尚未建立 title_ngrams 的舊文件補上標題二元組（已補過的文件不會重複處理）
+        
+        耗時與舊文件數量成正比，由 db_manager.py backfill-ngrams 執行，不在 API 啟動時呼叫
+        
+        Returns:
+            int: 更新的文件數
+        """
+        collection = News._get_collection()
+        cursor = collection.find({'title_ngrams': {'$exists': False}}, {'title': 1})
+        
+        updated = 0
+        operations = []
+        for doc in cursor:
+            operations.append(UpdateOne(
+                {'_id': doc['_id']},
+                {'$set': {'title_ngrams': title_ngrams(doc.get('title') or '')}}
+            ))
+            if len(operations) >= INSERT_BATCH_SIZE:
+                updated += collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        
+        if operations:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+        
+        if updated:
+            logger.info(f"已補上 {updated} 筆新聞的標題二元組")
+        
+        self._ngrams_ready = True
+        return updated
     
     def insert_news_item(self, news_data: Dict[str, Any]) -> bool:
         """
@@ -31,8 +219,6 @@ class NewsMongoDatabase:
             bool: 插入成功返回 True，已存在返回 False
         """
         try:
-            from .models_mongodb import News
-            
             # 檢查是否已存在
             news_source = news_data.get('news_source', '')
             news_id = news_data.get('news_id', '')
@@ -47,6 +233,7 @@ class NewsMongoDatabase:
             # 創建新記錄
             news = News.create_from_dict(news_data)
             news.save()
+            self.invalidate_count_cache()
             return True
                 
         except Exception as e:
@@ -69,69 +256,42 @@ class NewsMongoDatabase:
         insert_count = 0
         
         try:
-            from .models_mongodb import News
-            
-            # 批量檢查已存在的新聞
-            existing_pairs = set()
-            if news_items:
-                # 獲取所有需要檢查的 (news_source, news_id) 對
-                check_items = [(item.get('news_source'), item.get('news_id')) for item in news_items]
-                
-                # 批量查詢已存在的記錄
-                for news_source, news_id in check_items:
-                    if News.exists(news_source, news_id):
-                        existing_pairs.add((news_source, news_id))
-            
-            # 過濾出需要插入的新聞
-            news_to_insert = []
+            # 直接建立原始文件交給 pymongo，不經 MongoEngine Document 建構與轉換
+            documents = []
             for item in news_items:
-                pair = (item.get('news_source'), item.get('news_id'))
-                if pair not in existing_pairs:
-                    news = News.create_from_dict(item)
-                    news_to_insert.append(news)
+                try:
+                    documents.append(News.raw_from_dict(item))
+                except ValueError as e:
+                    logger.error(f"新聞資料驗證失敗: {e} - 標題: {item.get('title', 'unknown')}")
             
-            # 批量插入
-            if news_to_insert:
-                # MongoDB 批量插入
-                for news in news_to_insert:
-                    try:
-                        news.save()
-                        insert_count += 1
-                    except Exception as e:
-                        logger.error(f"插入單筆新聞失敗: {e}")
-                        continue
-                
+            # 分批以 insert_many(ordered=False) 寫入，已存在的新聞由
+            # (news_source, news_id) 唯一索引拒絕，不需逐筆先查詢
+            collection = News._get_collection()
+            
+            for start in range(0, len(documents), INSERT_BATCH_SIZE):
+                batch = documents[start:start + INSERT_BATCH_SIZE]
+                try:
+                    result = collection.insert_many(batch, ordered=False)
+                    insert_count += len(result.inserted_ids)
+                except BulkWriteError as e:
+                    insert_count += e.details.get('nInserted', 0)
+                    # 重複鍵 (11000) 代表新聞已存在，其餘錯誤需記錄
+                    other_errors = [err for err in e.details.get('writeErrors', []) if err.get('code') != 11000]
+                    for err in other_errors:
+                        logger.error(f"插入單筆新聞失敗: {err.get('errmsg')}")
+            
+            if insert_count:
+                self.invalidate_count_cache()
                 logger.info(f"批量插入成功: {insert_count} 條新聞")
             else:
                 logger.info("沒有需要插入的新聞（全部已存在）")
         
         except Exception as e:
+            # 無序批量寫入已會略過失敗的文件，其他錯誤（例如連線中斷）不回退逐筆重試，
+            # 回傳已完成批次的插入數量，未寫入的新聞於下次爬取時再插入
             logger.error(f"批量插入新聞失敗: {e}")
-            # 如果批量插入失敗，回退到逐一插入
-            logger.info("回退到逐一插入模式...")
-            return self._insert_news_one_by_one(news_items)
-        
-        return insert_count
-    
-    def _insert_news_one_by_one(self, news_items: List[Dict[str, Any]]) -> int:
-        """
-        逐一插入新聞記錄（作為批量插入的備用方案）
-        
-        Args:
-            news_items: 新聞資料列表
-            
-        Returns:
-            int: 成功插入的數量
-        """
-        insert_count = 0
-        
-        for item in news_items:
-            try:
-                if self.insert_news_item(item):
-                    insert_count += 1
-            except Exception as e:
-                logger.error(f"插入單筆新聞失敗: {e} - 標題: {item.get('title', 'unknown')}")
-                continue
+            if insert_count:
+                self.invalidate_count_cache()
         
         return insert_count
     
@@ -147,33 +307,96 @@ class NewsMongoDatabase:
             bool: 存在返回 True，否則 False
         """
         try:
-            from .models_mongodb import News
             return News.exists(news_source, news_id)
         except Exception as e:
             logger.error(f"檢查新聞是否存在時發生錯誤: {e}")
             return False
     
+    def get_existing_news_ids(self, news_source: str, news_ids: List[str]) -> Set[str]:
+        """
+        以單一查詢取得指定來源中已存在的新聞ID
+        
+        Args:
+            news_source: 新聞來源
+            news_ids: 要檢查的新聞ID列表
+            
+        Returns:
+            Set[str]: 已存在的新聞ID集合
+        """
+        if not news_ids:
+            return set()
+        
+        try:
+            cursor = News._get_collection().find(
+                {'news_source': news_source, 'news_id': {'$in': list(set(news_ids))}},
+                {'news_id': 1, '_id': 0}
+            )
+            return {doc['news_id'] for doc in cursor}
+        except Exception as e:
+            logger.error(f"批量檢查新聞是否存在時發生錯誤: {e}")
+            return set()
+    
+    def get_news_by_pk(self, pk: ObjectId) -> Optional[Dict[str, Any]]:
+        """
+        以 _id 取得單條新聞，直接使用 pymongo find_one，不經 Document 建構
+        
+        Args:
+            pk: 新聞的 ObjectId
+            
+        Returns:
+            Optional[Dict]: 新聞資料，不存在時返回 None
+        """
+        doc = News._get_collection().find_one({'_id': pk}, LIST_PROJECTION)
+        return News.raw_to_dict(doc) if doc else None
+    
     def get_news_count(self) -> int:
-        """獲取新聞總數"""
+        """獲取新聞總數（短時間快取）"""
         try:
-            from .models_mongodb import News
-            return News.objects.count()
+            cached = self._get_cached_count(('total',))
+            if cached is not None:
+                return cached
+            
+            total = News.objects.count()
+            self._set_cached_count(('total',), total)
+            return total
         except Exception as e:
             logger.error(f"獲取新聞總數失敗: {e}")
             return 0
     
-    def get_news_count_by_source(self) -> List[tuple]:
-        """獲取各新聞來源的新聞數量"""
+    def get_news_count_by_source(self,
+                                 since: Optional[datetime] = None,
+                                 news_source: Optional[str] = None) -> List[tuple]:
+        """
+        獲取各新聞來源的新聞數量
+        
+        Args:
+            since: 只計算此時間（含）之後建立的新聞
+            news_source: 只計算指定來源
+            
+        Returns:
+            List[tuple]: (來源, 數量)，依數量由多到少排序
+        """
         try:
-            from .models_mongodb import News
+            collection = News._get_collection()
             
-            # 使用 MongoDB 聚合查詢
-            pipeline = [
-                {"$group": {"_id": "$news_source", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]
+            match = {}
+            if news_source:
+                match['news_source'] = news_source
+            if since:
+                match['create_time'] = {'$gte': since}
+            
+            if not match:
+                # 全集合計數：$sortByCount 等同 $group + $sort
+                result = collection.aggregate([{"$sortByCount": "$news_source"}])
+            else:
+                # 過濾條件放在第一個階段，由 (news_source, -create_time, -_id) 索引縮小掃描範圍
+                pipeline = [
+                    {"$match": match},
+                    {"$group": {"_id": "$news_source", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}}
+                ]
+                result = collection.aggregate(pipeline)
             
-            result = News.objects.aggregate(pipeline)
             return [(item['_id'], item['count']) for item in result]
             
         except Exception as e:
@@ -183,115 +406,166 @@ class NewsMongoDatabase:
     def get_recent_news(self, limit: int = 10) -> List[Dict[str, Any]]:
         """獲取最近的新聞"""
         try:
-            from .models_mongodb import News
-            
-            news_list = News.objects.order_by('-create_time').limit(limit)
-            return [news.to_dict() for news in news_list]
+            # 直接以 pymongo 投影查詢原始文件，不經 QuerySet 與 Document 建構
+            cursor = (News._get_collection()
+                      .find({}, LIST_PROJECTION)
+                      .sort('create_time', -1)
+                      .limit(limit))
+            return [News.raw_to_dict(doc) for doc in cursor]
             
         except Exception as e:
             logger.error(f"獲取最近新聞失敗: {e}")
             return []
     
+    def _build_query_filter(self,
+                            news_source: Optional[str] = None,
+                            search: Optional[str] = None,
+                            author: Optional[str] = None,
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        建構 MongoDB 原生查詢條件
+
+        Args:
+            news_source: 新聞來源過濾
+            search: 標題搜尋關鍵字
+            author: 作者過濾
+            start_date: 開始日期 (當天零時)
+            end_date: 結束日期 (當天零時，包含當天)
+
+        Returns:
+            Dict: pymongo 查詢條件
+        """
+        query: Dict[str, Any] = {}
+
+        # 新聞來源過濾
+        if news_source:
+            query['news_source'] = news_source
+
+        # 標題搜尋 (不區分大小寫)
+        # 多個以空白分隔的關鍵字各自比對，標題需包含全部關鍵字 (不限順序)；
+        # title_ngrams 回填完成後先以多鍵索引縮小範圍，再以正則確認關鍵字連續出現
+        if search:
+            terms = search.split() or [search]
+            use_ngrams = self._title_ngrams_ready()
+            conditions = []
+            for term in terms:
+                condition = {'title': _compile_ci_pattern(term)}
+                grams = title_ngrams(term) if use_ngrams else None
+                if grams:
+                    condition['title_ngrams'] = {'$all': grams}
+                conditions.append(condition)
+            
+            if len(conditions) > 1:
+                query['$and'] = conditions
+            else:
+                query.update(conditions[0])
+
+        # 作者過濾
+        if author:
+            query['author'] = _compile_ci_pattern(author)
+
+        # 日期範圍查詢 (結束日期使用隔天零時作為不含上界，涵蓋當天最後一秒內的資料)
+        date_query = {}
+        if start_date:
+            date_query['$gte'] = start_date
+
+        if end_date:
+            date_query['$lt'] = end_date + timedelta(days=1)
+
+        if date_query:
+            query['create_time'] = date_query
+
+        return query
+
     def get_news_by_query(self, 
                          page: int = 1, 
                          per_page: int = 20,
                          news_source: Optional[str] = None,
                          search: Optional[str] = None,
                          author: Optional[str] = None,
-                         start_date: Optional[str] = None,
-                         end_date: Optional[str] = None,
+                         start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None,
                          sort_by: str = "create_time",
-                         sort_order: str = "desc") -> Dict[str, Any]:
+                         sort_order: str = "desc",
+                         cursor: Optional[str] = None) -> Dict[str, Any]:
         """
         根據查詢條件獲取新聞
         
+        提供 cursor 時使用 (create_time, _id) 游標分頁，固定依建立時間倒序，
+        不計算總數；否則使用傳統的 skip/limit 分頁。
+        
         Args:
             page: 頁碼
             per_page: 每頁數量
             news_source: 新聞來源過濾
             search: 標題搜尋關鍵字
             author: 作者過濾
-            start_date: 開始日期 (YYYY-MM-DD)
-            end_date: 結束日期 (YYYY-MM-DD)
+            start_date: 開始日期 (當天零時)
+            end_date: 結束日期 (當天零時，包含當天)
             sort_by: 排序欄位
             sort_order: 排序方向
+            cursor: 上一頁最後一筆的分頁游標
             
         Returns:
             Dict: 包含新聞列表和分頁資訊的字典
+            
+        Raises:
+            ValueError: 分頁游標格式無效、不支援的排序組合，或頁碼超過 skip 分頁上限
         """
+        sort_field = SORT_MAP.get((sort_by, sort_order.lower()))
+        if sort_field is None:
+            raise ValueError(f"不支援的排序方式: {sort_by} {sort_order}")
+
+        query = self._build_query_filter(news_source, search, author, start_date, end_date)
+
+        if cursor is not None:
+            # 游標格式錯誤交由呼叫端處理
+            last_create_time, last_pk = decode_cursor(cursor)
+            return self._get_news_by_cursor(query, per_page, last_create_time, last_pk)
+        
+        if (page - 1) * per_page > MAX_SKIP_OFFSET:
+            raise ValueError(f"頁碼分頁最多跳過 {MAX_SKIP_OFFSET} 筆，更深的頁面請使用 cursor 分頁")
+
         try:
-            from .models_mongodb import News
-            from datetime import datetime
-            import re
-            
-            # 建構查詢條件
-            query = {}
-            
-            # 新聞來源過濾
-            if news_source:
-                query['news_source'] = news_source
-            
-            # 標題搜尋 (使用正則表達式，不區分大小寫)
-            if search:
-                query['title__iregex'] = re.escape(search)
-            
-            # 作者過濾
-            if author:
-                query['author__iregex'] = re.escape(author)
-            
-            # 日期範圍查詢
-            date_query = {}
-            if start_date:
-                try:
-                    start_datetime = datetime.strptime(start_date, '%Y-%m-%d')
-                    date_query['create_time__gte'] = start_datetime
-                except ValueError:
-                    logger.warning(f"無效的開始日期格式: {start_date}")
-            
-            if end_date:
-                try:
-                    end_datetime = datetime.strptime(end_date, '%Y-%m-%d')
-                    # 設定為當天的結束時間
-                    end_datetime = end_datetime.replace(hour=23, minute=59, second=59)
-                    date_query['create_time__lte'] = end_datetime
-                except ValueError:
-                    logger.warning(f"無效的結束日期格式: {end_date}")
-            
-            # 合併日期查詢條件
-            query.update(date_query)
+            collection = News._get_collection()
+            offset = (page - 1) * per_page
             
-            # 獲取總數
-            total = News.objects.filter(**query).count()
+            if query:
+                # 有過濾條件時以單一聚合同時取得總數與當頁資料，只需一次往返與一次掃描
+                total, docs = self._aggregate_page(collection, query, sort_field, offset, per_page)
+                data = [News.raw_to_dict(doc) for doc in docs]
+            else:
+                # 無過濾條件時總數直接使用集合中繼資料估算，不需掃描文件
+                total = collection.estimated_document_count()
+                
+                # 獲取數據 (以 _id 作為次要排序，確保結果穩定)
+                # 以 as_pymongo 直接讀取原始文件並逐筆轉換，省去 Document 物件建構
+                news_cursor = (News.objects
+                               .only(*LIST_FIELDS)
+                               .order_by(*_with_tiebreaker(sort_field))
+                               .skip(offset)
+                               .limit(per_page)
+                               .as_pymongo())
+                data = [News.raw_to_dict(doc) for doc in news_cursor]
             
             # 計算分頁
-            offset = (page - 1) * per_page
             pages = (total + per_page - 1) // per_page
             
-            # 準備排序
-            sort_field = sort_by
-            if sort_order.lower() == 'desc':
-                sort_field = f'-{sort_by}'
-            
-            # 確保排序欄位有效
-            valid_sort_fields = ['create_time', 'publish_time', 'title', 'news_source', 'author']
-            base_sort_field = sort_by.lstrip('-')
-            if base_sort_field not in valid_sort_fields:
-                sort_field = '-create_time'  # 默認排序
-                logger.warning(f"無效的排序欄位: {sort_by}, 使用默認排序")
-            
-            # 獲取數據
-            news_list = (News.objects
-                        .filter(**query)
-                        .order_by(sort_field)
-                        .skip(offset)
-                        .limit(per_page))
+            # 預設排序時提供游標，讓用戶端可由此改用游標分頁
+            has_next = page < pages
+            next_cursor = None
+            if has_next and sort_field == DEFAULT_SORT and data and data[-1]['create_time']:
+                next_cursor = encode_cursor(data[-1]['create_time'], data[-1]['pk'])
             
             return {
                 'total': total,
                 'page': page,
                 'per_page': per_page,
                 'pages': pages,
-                'data': [news.to_dict() for news in news_list]
+                'has_next': has_next,
+                'next_cursor': next_cursor,
+                'data': data
             }
             
         except Exception as e:
@@ -301,25 +575,205 @@ class NewsMongoDatabase:
                 'page': page,
                 'per_page': per_page,
                 'pages': 0,
+                'has_next': False,
+                'next_cursor': None,
                 'data': []
             }
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """獲取資料庫統計資訊"""
+
+    def _aggregate_page(self,
+                        collection,
+                        query: Dict[str, Any],
+                        sort_field: str,
+                        offset: int,
+                        per_page: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        以 $facet 在同一次聚合中計算總數並取得當頁資料
+
+        $match 與 $sort 置於 $facet 之前，排序由 (欄位, _id) 複合索引提供，不需在記憶體中排序
+
+        Args:
+            collection: pymongo 集合
+            query: 查詢條件
+            sort_field: 排序欄位 (前綴 '-' 表示倒序)
+            offset: 略過筆數
+            per_page: 每頁數量
+
+        Returns:
+            Tuple: (總數, 當頁原始文件列表)
+        """
+        direction = -1 if sort_field.startswith('-') else 1
+        pipeline = [
+            {'$match': query},
+            {'$sort': {sort_field.lstrip('-'): direction, '_id': direction}},
+            {'$facet': {
+                'total': [{'$count': 'count'}],
+                'data': [
+                    {'$skip': offset},
+                    {'$limit': per_page},
+                    {'$project': LIST_PROJECTION},
+                ],
+            }},
+        ]
+
+        result = next(collection.aggregate(pipeline, allowDiskUse=True), None)
+        if not result:
+            return 0, []
+
+        total = result['total'][0]['count'] if result['total'] else 0
+        return total, result['data']
+
+    def _get_news_by_cursor(self,
+                            query: Dict[str, Any],
+                            per_page: int,
+                            last_create_time: datetime,
+                            last_pk: ObjectId) -> Dict[str, Any]:
+        """
+        以 (create_time, _id) 游標分頁查詢，每頁皆為索引範圍掃描，與頁數深度無關
+
+        Args:
+            query: 基本查詢條件
+            per_page: 每頁數量
+            last_create_time: 上一頁最後一筆的建立時間
+            last_pk: 上一頁最後一筆的 _id
+
+        Returns:
+            Dict: 包含新聞列表和分頁資訊的字典 (不含總數)
+        """
         try:
-            total_count = self.get_news_count()
-            source_counts = dict(self.get_news_count_by_source())
-            
-            # 獲取最新更新時間
-            from .models_mongodb import News
-            latest_news = News.objects.order_by('-create_time').first()
-            latest_update = latest_news.create_time if latest_news else None
-            
+
+            keyset = {'$or': [
+                {'create_time': {'$lt': last_create_time}},
+                {'create_time': last_create_time, '_id': {'$lt': last_pk}},
+            ]}
+            cursor_query = {'$and': [query, keyset]} if query else keyset
+
+            # 多取一筆用來判斷是否還有下一頁
+            news_cursor = (News.objects(__raw__=cursor_query)
+                           .only(*LIST_FIELDS)
+                           .order_by(*CURSOR_ORDER)
+                           .limit(per_page + 1)
+                           .as_pymongo())
+            data = [News.raw_to_dict(doc) for doc in news_cursor]
+
+            has_next = len(data) > per_page
+            data = data[:per_page]
+
+            next_cursor = None
+            if has_next and data[-1]['create_time']:
+                next_cursor = encode_cursor(data[-1]['create_time'], data[-1]['pk'])
+
+            return {
+                'total': None,
+                'page': None,
+                'per_page': per_page,
+                'pages': None,
+                'has_next': has_next,
+                'next_cursor': next_cursor,
+                'data': data
+            }
+
+        except Exception as e:
+            logger.error(f"游標查詢新聞失敗: {e}")
             return {
-                'total_news': total_count,
-                'sources': source_counts,
-                'latest_update': latest_update
+                'total': None,
+                'page': None,
+                'per_page': per_page,
+                'pages': None,
+                'has_next': False,
+                'next_cursor': None,
+                'data': []
             }
+
+    def count_news(self,
+                   news_source: Optional[str] = None,
+                   search: Optional[str] = None,
+                   author: Optional[str] = None,
+                   start_date: Optional[datetime] = None,
+                   end_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        計算符合條件的新聞數量，無過濾條件時使用集合中繼資料估算（短時間快取）
+
+        Returns:
+            Dict: {'total': 數量, 'estimated': 是否為估算值}
+        """
+        try:
+
+            key = ('count_news', news_source, search, author, start_date, end_date)
+            cached = self._get_cached_count(key)
+            if cached is not None:
+                return cached
+
+            query = self._build_query_filter(news_source, search, author, start_date, end_date)
+            collection = News._get_collection()
+
+            if not query:
+                result = {'total': collection.estimated_document_count(), 'estimated': True}
+            else:
+                result = {'total': collection.count_documents(query), 'estimated': False}
+
+            self._set_cached_count(key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"計算新聞數量失敗: {e}")
+            return {'total': 0, 'estimated': False}
+    
+    def _compute_stats(self) -> Dict[str, Any]:
+        """以單一 $facet 聚合查詢計算統計資訊（一次往返取得總數、各來源數量與最新時間）"""
+        pipeline = [
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "by_source": [
+                    {"$group": {"_id": "$news_source", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}}
+                ],
+                "latest": [
+                    {"$sort": {"create_time": -1}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "create_time": 1}}
+                ]
+            }}
+        ]
+        
+        result = next(News._get_collection().aggregate(pipeline, allowDiskUse=True))
+        
+        total = result['total']
+        latest = result['latest']
+        
+        return {
+            'total_news': total[0]['count'] if total else 0,
+            'sources': {item['_id']: item['count'] for item in result['by_source']},
+            'latest_update': latest[0].get('create_time') if latest else None
+        }
+    
+    def refresh_stats(self) -> Dict[str, Any]:
+        """
+        重新計算統計資訊並寫入統計快照（由排程爬蟲任務完成後呼叫）
+        
+        Returns:
+            Dict: 最新的統計資訊
+        """
+        stats = self._compute_stats()
+        News._get_db()[STATS_COLLECTION].replace_one(
+            {'_id': STATS_DOC_ID},
+            {**stats, 'refreshed_at': datetime.utcnow()},
+            upsert=True
+        )
+        logger.info(f"統計快照已更新: 總計 {stats['total_news']} 條新聞")
+        return stats
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """獲取資料庫統計資訊（讀取統計快照，尚未產生時即時計算）"""
+        try:
+            snapshot = News._get_db()[STATS_COLLECTION].find_one({'_id': STATS_DOC_ID})
+            if snapshot:
+                return {
+                    'total_news': snapshot.get('total_news', 0),
+                    'sources': snapshot.get('sources', {}),
+                    'latest_update': snapshot.get('latest_update')
+                }
+            
+            return self.refresh_stats()
         except Exception as e:
             logger.error(f"獲取統計資訊失敗: {e}")
             return {
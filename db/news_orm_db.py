@@ -1,13 +1,115 @@
 """
 基於 SQLAlchemy ORM 的新聞資料庫管理類
 """
-from sqlalchemy.exc import IntegrityError
+import logging
+import re
+from contextlib import closing
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List, Dict, Any, Optional
+from sqlalchemy import String, func, and_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Dict, Any, Optional, Set
 from .models import News
 from .database_orm import get_db_session, init_database
 
+logger = logging.getLogger(__name__)
+
+# 依資料庫方言選擇支援 ON CONFLICT 的 INSERT 建構函數
+_DIALECT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+# 每條多列 INSERT 的資料筆數（SQLite 綁定參數數量有上限）
+INSERT_BATCH_SIZE = 500
+
+# 列表查詢選取的欄位（與 News.to_dict() 的鍵相同）
+_NEWS_COLUMNS = (
+    News.pk,
+    News.news_id,
+    News.news_source,
+    News.author,
+    News.title,
+    News.url,
+    News.publish_time,
+    News.create_time,
+)
+
+# 舊資料庫 ID 前綴 -> 新聞來源（例如 'tvbs_123' -> ('TVBS', '123')）
+_OLD_ID_SOURCES = {
+    'chinatimes': 'ChinaTimes',
+    'tvbs': 'TVBS',
+    'ltn': 'LTN',
+    'setn': 'SETN',
+}
+_OLD_ID_PATTERN = re.compile(r'(chinatimes|tvbs|ltn|setn)_(.*)', re.DOTALL)
+
+# 有長度限制的字串欄位 (_news_row 使用)
+_MAX_LENGTHS = {
+    column.name: column.type.length
+    for column in News.__table__.columns
+    if isinstance(column.type, String) and column.type.length
+}
+
+
+def _insert_ignore_duplicates(dialect_name: str, rows: List[Dict[str, Any]]):
+    """建立重複的 (news_source, news_id) 直接略過的多列 INSERT 陳述式"""
+    insert = _DIALECT_INSERTS.get(dialect_name)
+    if insert is None:
+        raise NotImplementedError(f"不支援 ON CONFLICT 的資料庫: {dialect_name}")
+    return insert(News).values(rows).on_conflict_do_nothing(
+        index_elements=['news_source', 'news_id']
+    )
+
+
+def _news_row(news_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    將新聞資料字典轉為 news 資料表的欄位值
+    
+    只檢查必填欄位與長度限制，不符時拋出 ValueError（避免單筆資料讓整批 INSERT 失敗）
+    """
+    row = {
+        'news_id': news_data.get('news_id') or '',
+        'news_source': news_data.get('news_source') or '',
+        'author': news_data.get('author') or '',
+        'title': news_data.get('title') or '',
+        'url': news_data.get('url') or '',
+        'publish_time': news_data.get('publish_time') or ''
+    }
+    
+    for name in ('news_id', 'news_source'):
+        if not row[name]:
+            raise ValueError(f"缺少必要欄位: {name}")
+    
+    for name, max_length in _MAX_LENGTHS.items():
+        if len(row[name]) > max_length:
+            raise ValueError(f"欄位 {name} 超過長度上限 {max_length}")
+    
+    return row
+
+
+def _legacy_news_row(old_id: str, news_name: Optional[str], author: Optional[str],
+                     title: Optional[str], url: Optional[str], publish_time: Optional[str]) -> Dict[str, Any]:
+    """將舊資料庫的一列轉為 news 資料表的欄位值"""
+    # 解析新聞來源和ID
+    match = _OLD_ID_PATTERN.match(old_id)
+    if match:
+        news_source = _OLD_ID_SOURCES[match.group(1)]
+        news_id = match.group(2)  # 去除來源前綴
+    else:
+        # 使用 news_name 作為來源
+        news_source = news_name or 'Unknown'
+        news_id = old_id
+    
+    return {
+        'news_id': news_id,
+        'news_source': news_source,
+        'author': author or '',
+        'title': title or '',
+        'url': url or '',
+        'publish_time': publish_time or ''
+    }
+
 
 class NewsORMDatabase:
     """使用 ORM 的新聞資料庫管理類"""
@@ -30,36 +132,14 @@ class NewsORMDatabase:
         """
         try:
             with get_db_session() as session:
-                # 檢查是否已存在
-                existing = session.query(News).filter(
-                    and_(
-                        News.news_source == news_data.get('news_source'),
-                        News.news_id == news_data.get('news_id')
-                    )
-                ).first()
-                
-                if existing:
-                    return False  # 已存在
-                
-                # 創建新記錄
-                news = News(
-                    news_id=news_data.get('news_id'),
-                    news_source=news_data.get('news_source'),
-                    author=news_data.get('author', ''),
-                    title=news_data.get('title', ''),
-                    url=news_data.get('url', ''),
-                    publish_time=news_data.get('publish_time', '')
-                )
+                # 單一 INSERT ... ON CONFLICT DO NOTHING：已存在時不插入，
+                # 不需先查詢，也不會在並行爬蟲間產生先查後寫的競爭
+                dialect_name = session.get_bind().dialect.name
+                stmt = _insert_ignore_duplicates(dialect_name, [_news_row(news_data)])
+                return session.execute(stmt).rowcount == 1
                 
-                session.add(news)
-                session.commit()
-                return True
-                
-        except IntegrityError:
-            # 唯一約束違反，資料已存在
-            return False
         except Exception as e:
-            print(f"插入新聞失敗: {e}")
+            logger.error("插入新聞失敗: %s", e)
             return False
     
     def insert_news_batch(self, news_items: List[Dict[str, Any]]) -> int:
@@ -77,101 +157,89 @@ class NewsORMDatabase:
             
         insert_count = 0
         
+        rows = []
+        for item in news_items:
+            try:
+                rows.append(_news_row(item))
+            except ValueError as e:
+                logger.error("新聞資料驗證失敗: %s - 標題: %s", e, item.get('title', 'unknown'))
+        
+        if not rows:
+            return 0
+        
         try:
             with get_db_session() as session:
-                # 批量檢查已存在的新聞ID
-                existing_pairs = set()
-                if news_items:
-                    # 獲取所有需要檢查的 (news_source, news_id) 對
-                    check_pairs = [(item.get('news_source'), item.get('news_id')) for item in news_items]
-                    
-                    # 批量查詢已存在的記錄
-                    existing_query = session.query(News.news_source, News.news_id).filter(
-                        and_(
-                            News.news_source.in_([pair[0] for pair in check_pairs]),
-                            News.news_id.in_([pair[1] for pair in check_pairs])
-                        )
-                    ).all()
-                    
-                    existing_pairs = {(row.news_source, row.news_id) for row in existing_query}
+                # 重複的 (news_source, news_id) 由唯一約束以 ON CONFLICT DO NOTHING 略過，
+                # 不需先查詢已存在的記錄；每批一條多列 INSERT 陳述式
+                dialect_name = session.get_bind().dialect.name
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    stmt = _insert_ignore_duplicates(dialect_name, rows[start:start + INSERT_BATCH_SIZE])
+                    insert_count += session.execute(stmt).rowcount
                 
-                # 過濾出需要插入的新聞
-                news_to_insert = []
-                for item in news_items:
-                    pair = (item.get('news_source'), item.get('news_id'))
-                    if pair not in existing_pairs:
-                        news = News(
-                            news_id=item.get('news_id'),
-                            news_source=item.get('news_source'),
-                            author=item.get('author', ''),
-                            title=item.get('title', ''),
-                            url=item.get('url', ''),
-                            publish_time=item.get('publish_time', '')
-                        )
-                        news_to_insert.append(news)
-                
-                # 批量插入
-                if news_to_insert:
-                    session.add_all(news_to_insert)
-                    session.commit()
-                    insert_count = len(news_to_insert)
-                    print(f"批量插入成功: {insert_count} 條新聞")
+                if insert_count:
+                    logger.info("批量插入成功: %d 條新聞", insert_count)
                 else:
-                    print("沒有需要插入的新聞（全部已存在）")
+                    logger.info("沒有需要插入的新聞（全部已存在）")
         
         except Exception as e:
-            print(f"批量插入新聞失敗: {e}")
-            # 如果批量插入失敗，回退到逐一插入
-            print("回退到逐一插入模式...")
-            return self._insert_news_one_by_one(news_items)
+            # 重複資料已由 ON CONFLICT DO NOTHING 略過，其他錯誤不回退逐筆重試；
+            # 交易已回滾，未寫入的新聞於下次爬取時再插入
+            logger.error("批量插入新聞失敗: %s", e)
+            return 0
         
         return insert_count
     
-    def _insert_news_one_by_one(self, news_items: List[Dict[str, Any]]) -> int:
+    def news_exists(self, news_source: str, news_id: str) -> bool:
         """
-        逐一插入新聞記錄（作為批量插入的備用方案）
+        檢查新聞是否已存在
         
         Args:
-            news_items: 新聞資料列表
+            news_source: 新聞來源
+            news_id: 新聞ID
             
         Returns:
-            int: 成功插入的數量
+            bool: 存在返回 True，否則 False
         """
-        insert_count = 0
-        
-        for item in news_items:
-            try:
-                if self.insert_news_item(item):
-                    insert_count += 1
-            except Exception as e:
-                print(f"插入單筆新聞失敗: {e} - 標題: {item.get('title', 'unknown')}")
-                continue
-        
-        return insert_count
+        try:
+            with get_db_session() as session:
+                return session.query(
+                    session.query(News).filter(
+                        and_(
+                            News.news_source == news_source,
+                            News.news_id == news_id
+                        )
+                    ).exists()
+                ).scalar()
+        except Exception as e:
+            logger.error("檢查新聞是否存在時發生錯誤: %s", e)
+            return False
     
-    def news_exists(self, news_source: str, news_id: str) -> bool:
+    def get_existing_news_ids(self, news_source: str, news_ids: List[str]) -> Set[str]:
         """
-        檢查新聞是否已存在
+        以單一查詢取得指定來源中已存在的新聞ID
         
         Args:
             news_source: 新聞來源
-            news_id: 新聞ID
+            news_ids: 要檢查的新聞ID列表
             
         Returns:
-            bool: 存在返回 True，否則 False
+            Set[str]: 已存在的新聞ID集合
         """
+        if not news_ids:
+            return set()
+        
         try:
             with get_db_session() as session:
-                exists = session.query(News).filter(
+                rows = session.query(News.news_id).filter(
                     and_(
                         News.news_source == news_source,
-                        News.news_id == news_id
+                        News.news_id.in_(set(news_ids))
                     )
-                ).first() is not None
-                return exists
+                ).all()
+                return {row.news_id for row in rows}
         except Exception as e:
-            print(f"檢查新聞是否存在時發生錯誤: {e}")
-            return False
+            logger.error("批量檢查新聞是否存在時發生錯誤: %s", e)
+            return set()
     
     def get_news_count(self) -> int:
         """獲取新聞總數"""
@@ -179,7 +247,7 @@ class NewsORMDatabase:
             with get_db_session() as session:
                 return session.query(News).count()
         except Exception as e:
-            print(f"獲取新聞總數失敗: {e}")
+            logger.error("獲取新聞總數失敗: %s", e)
             return 0
     
     def get_news_count_by_source(self) -> List[tuple]:
@@ -193,20 +261,26 @@ class NewsORMDatabase:
                 
                 return [(row.news_source, row.count) for row in result]
         except Exception as e:
-            print(f"獲取各來源新聞數量失敗: {e}")
+            logger.error("獲取各來源新聞數量失敗: %s", e)
             return []
     
     def get_recent_news(self, limit: int = 10) -> List[Dict[str, Any]]:
         """獲取最近的新聞"""
         try:
             with get_db_session() as session:
-                news_list = session.query(News).order_by(
+                # 只選取需要的欄位，回傳 Row 而非 ORM 物件，省去實例建構與 identity map
+                rows = session.query(*_NEWS_COLUMNS).order_by(
                     News.create_time.desc()
                 ).limit(limit).all()
                 
-                return [news.to_dict() for news in news_list]
+                news_list = []
+                for row in rows:
+                    news = dict(row._mapping)
+                    news['create_time'] = news['create_time'].isoformat() if news['create_time'] else None
+                    news_list.append(news)
+                return news_list
         except Exception as e:
-            print(f"獲取最近新聞失敗: {e}")
+            logger.error("獲取最近新聞失敗: %s", e)
             return []
     
     def migrate_from_old_database(self, old_db_path: Optional[str] = None):
@@ -218,79 +292,57 @@ class NewsORMDatabase:
         """
         import sqlite3
         import os
-        import re
+        from pathlib import Path
         
         if not old_db_path:
             old_db_path = os.path.join(os.path.dirname(__file__), 'scrapying', 'news_old.db')
         
         if not os.path.exists(old_db_path):
-            print("舊資料庫檔案不存在，跳過遷移")
+            logger.info("舊資料庫檔案不存在，跳過遷移")
             return
         
         try:
-            # 連接舊資料庫
-            old_conn = sqlite3.connect(old_db_path)
-            old_cursor = old_conn.cursor()
-            
-            # 檢查舊表結構
-            old_cursor.execute("PRAGMA table_info(news)")
-            columns = [col[1] for col in old_cursor.fetchall()]
-            
-            if 'id' in columns and 'news_name' in columns:
-                # 舊格式資料
-                old_cursor.execute("SELECT id, news_name, author, title, url, publish_time FROM news")
-                old_data = old_cursor.fetchall()
+            # 以唯讀模式連接舊資料庫，結束（包含發生錯誤）時一定關閉連線，不持續佔用檔案
+            with closing(sqlite3.connect(f"{Path(old_db_path).resolve().as_uri()}?mode=ro", uri=True)) as old_conn:
+                old_cursor = old_conn.cursor()
                 
-                migrated_count = 0
-                with get_db_session() as session:
-                    for row in old_data:
-                        old_id, news_name, author, title, url, publish_time = row
-                        
-                        # 解析新聞來源和ID
-                        if old_id.startswith('chinatimes_'):
-                            news_source = 'ChinaTimes'
-                            news_id = old_id[11:]  # 去除 'chinatimes_' 前綴
-                        elif old_id.startswith('tvbs_'):
-                            news_source = 'TVBS'
-                            news_id = old_id[5:]   # 去除 'tvbs_' 前綴
-                        elif old_id.startswith('ltn_'):
-                            news_source = 'LTN'
-                            news_id = old_id[4:]   # 去除 'ltn_' 前綴
-                        elif old_id.startswith('setn_'):
-                            news_source = 'SETN'
-                            news_id = old_id[5:]   # 去除 'setn_' 前綴
-                        else:
-                            # 使用 news_name 作為來源
-                            news_source = news_name or 'Unknown'
-                            news_id = old_id
-                        
-                        # 檢查是否已存在
-                        existing = session.query(News).filter(
-                            and_(
-                                News.news_source == news_source,
-                                News.news_id == news_id
-                            )
-                        ).first()
-                        
-                        if not existing:
-                            news = News(
-                                news_id=news_id,
-                                news_source=news_source,
-                                author=author or '',
-                                title=title or '',
-                                url=url or '',
-                                publish_time=publish_time or ''
-                            )
-                            session.add(news)
-                            migrated_count += 1
+                # 檢查舊表結構
+                old_cursor.execute("PRAGMA table_info(news)")
+                columns = [col[1] for col in old_cursor.fetchall()]
                 
-                print(f"成功遷移 {migrated_count} 筆舊資料")
-            
-            old_conn.close()
-            
+                if 'id' in columns and 'news_name' in columns:
+                    # 舊格式資料
+                    # 以 fetchmany 分批讀取游標並寫入，記憶體用量只與批次大小有關
+                    old_cursor.execute("SELECT id, news_name, author, title, url, publish_time FROM news")
+                    
+                    migrated_count = 0
+                    with get_db_session() as session:
+                        dialect_name = session.get_bind().dialect.name
+                        
+                        # 已存在的記錄由唯一約束略過，每取一批即寫入並提交
+                        while True:
+                            batch = old_cursor.fetchmany(INSERT_BATCH_SIZE)
+                            if not batch:
+                                break
+                            
+                            rows = [_legacy_news_row(*row) for row in batch]
+                            migrated_count += session.execute(
+                                _insert_ignore_duplicates(dialect_name, rows)
+                            ).rowcount
+                            session.commit()
+                    
+                    logger.info("成功遷移 %d 筆舊資料", migrated_count)
+        
         except Exception as e:
-            print(f"資料遷移失敗: {e}")
+            logger.error("資料遷移失敗: %s", e)
+
 
+# 創建全域實例 - 延遲初始化（匯入模組時不連線資料庫、不建立資料表）
+news_orm_db = None
 
-# 創建全域實例
-news_orm_db = NewsORMDatabase()
+def get_news_orm_db() -> NewsORMDatabase:
+    """獲取或創建 NewsORMDatabase 實例"""
+    global news_orm_db
+    if news_orm_db is None:
+        news_orm_db = NewsORMDatabase()
+    return news_orm_db
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 資料庫管理工具 - 簡化版本
-提供配置顯示、連接測試、統計資訊
+提供配置顯示、連接測試、統計資訊、MongoDB 資料回填
 """
 
 import sys
@@ -68,11 +68,25 @@ def test_connection():
     except Exception as e:
         print(f"❌ 連接測試失敗: {e}")
 
+def backfill_ngrams():
+    """為 MongoDB 舊新聞補上標題二元組（title_ngrams），完成後標題搜尋才會使用二元組索引"""
+    try:
+        from db.news_mongodb import get_news_mongo_db
+        
+        print("=== 回填標題二元組 ===")
+        updated = get_news_mongo_db().backfill_title_ngrams()
+        print(f"✅ 回填完成，更新 {updated} 筆新聞")
+        
+    except Exception as e:
+        print(f"❌ 回填失敗: {e}")
+        sys.exit(1)
+
 def main():
     if len(sys.argv) < 2:
         print("使用方式:")
         print("  python3 db_manager.py config    # 顯示配置")
         print("  python3 db_manager.py test      # 測試連接")
+        print("  python3 db_manager.py backfill-ngrams  # 回填 MongoDB 標題二元組")
         return
     
     command = sys.argv[1].lower()
@@ -83,6 +97,8 @@ def main():
         show_config()
         print()
         test_connection()
+    elif command == 'backfill-ngrams':
+        backfill_ngrams()
     else:
         print(f"未知命令: {command}")
 
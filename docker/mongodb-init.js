@@ -20,9 +20,12 @@ db.createUser({
 db.createCollection('news');
 
 // 創建索引
-db.news.createIndex({ 'news_source': 1 });
-db.news.createIndex({ 'news_id': 1 });
-db.news.createIndex({ 'create_time': -1 });
+db.news.createIndex({ 'create_time': -1, '_id': -1 });
+db.news.createIndex({ 'news_source': 1, 'create_time': -1, '_id': -1 });
+db.news.createIndex({ 'author': 1, 'create_time': -1 });
+db.news.createIndex({ 'publish_time': -1, '_id': -1 });
+db.news.createIndex({ 'title': 1, '_id': 1 });
+db.news.createIndex({ 'title_ngrams': 1 });
 db.news.createIndex({ 'news_source': 1, 'news_id': 1 }, { unique: true });
 
 print('news_analyze 資料庫初始化完成！');
@@ -8,7 +8,7 @@ import argparse
 import os
 import uvicorn
 from dotenv import load_dotenv
-from api.app import app
+from api.scheduler import get_scheduler_interval, SCHEDULER_LOCK_SUPPORTED
 
 # 載入環境變數
 load_dotenv()
@@ -19,6 +19,7 @@ def main():
     parser.add_argument("--host", default="0.0.0.0", help="服務器主機")
     parser.add_argument("--port", type=int, default=8000, help="服務器端口")
     parser.add_argument("--interval", type=int, help="爬蟲執行間隔（小時）")
+    parser.add_argument("--workers", type=int, default=1, help="worker 行程數（預設 1）")
     parser.add_argument("--reload", action="store_true", help="開發模式：自動重載")
     parser.add_argument("--log-level", default="info", help="日誌級別")
     
@@ -27,22 +28,36 @@ def main():
     # 設定排程間隔環境變數
     if args.interval:
         os.environ['SCHEDULER_INTERVAL'] = str(args.interval)
+        get_scheduler_interval.cache_clear()
         print(f"📅 設定爬蟲執行間隔: {args.interval} 小時")
     
+    # 自動重載只支援單一 worker；沒有檔案鎖時每個 worker 都會執行排程器，同樣限制為單一 worker
+    workers = args.workers
+    if args.reload:
+        workers = 1
+    elif workers > 1 and not SCHEDULER_LOCK_SUPPORTED:
+        print("⚠️ 此平台不支援排程器檔案鎖，改以單一 worker 啟動")
+        workers = 1
+    
     # 顯示啟動信息
     print("🚀 新聞分析系統")
     print("=" * 50)
     print(f"服務器地址: http://{args.host}:{args.port}")
     print(f"API 文檔: http://{args.host}:{args.port}/docs")
     print(f"排程間隔: {os.getenv('SCHEDULER_INTERVAL', '24')} 小時")
+    print(f"Worker 數: {workers}")
     print("=" * 50)
     
-    # 啟動 FastAPI 應用（包含內建 Scheduler）
+    # 啟動 FastAPI 應用（包含內建 Scheduler，多 worker 時僅由其中一個執行）
+    # 多 worker 與自動重載都需要以匯入字串指定應用
     uvicorn.run(
-        app,
+        "api.app:app",
         host=args.host,
         port=args.port,
         reload=args.reload,
+        workers=workers,
+        loop="auto",  # 已安裝 uvloop / httptools 時自動使用，否則退回 asyncio / h11
+        http="auto",
         log_level=args.log_level,
         access_log=True
     )
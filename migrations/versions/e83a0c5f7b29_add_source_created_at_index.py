@@ -0,0 +1,34 @@
+"""Add composite (source, created_at DESC) index for filtered listings
+
+Revision ID: e83a0c5f7b29
+Revises: 329301914add
+Create Date: 2026-10-16 11:05:49.204317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83a0c5f7b29'
+down_revision: Union[str, Sequence[str], None] = '329301914add'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 來源過濾 + 日期範圍 + ORDER BY created_at DESC 可由單一索引範圍掃描完成
+    # 日期條件需寫成 created_at >= :start_ts AND created_at < :end_ts，不可包 DATE()
+    op.create_index(
+        'idx_news_source_created',
+        'news',
+        ['source', sa.text('created_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_news_source_created', table_name='news')
@@ -1,18 +1,41 @@
 """
 新聞爬蟲套件
 包含各種新聞網站的爬蟲實作
+
+各爬蟲類別於首次存取時才匯入對應模組 (PEP 562)，
+匯入單一爬蟲模組時不會連帶載入其他爬蟲及其相依套件
 """
 
-from .base_scraper_orm import BaseNewsScraper
-from .setn_new import SETNScraper
-from .ltn_scraper_orm import LTNScraper
-from .tvbs_scraper_orm import TVBSScraper
-from .chinatimes_scraper_orm import ChinaTimesScraper
+import importlib
+
+# 類別名稱 -> 所在模組
+_LAZY_IMPORTS = {
+    'BaseNewsScraper': '.base_scraper_orm',
+    'SETNScraper': '.setn_new',
+    'LTNScraper': '.ltn_scraper_orm',
+    'TVBSScraper': '.tvbs_scraper_orm',
+    'ChinaTimesScraper': '.chinatimes_scraper_orm',
+}
 
 __all__ = [
     'BaseNewsScraper',
-    'SETNScraper', 
+    'SETNScraper',
     'LTNScraper',
     'TVBSScraper',
     'ChinaTimesScraper'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # 快取於套件命名空間，之後的存取不再經過 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
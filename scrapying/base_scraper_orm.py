@@ -2,21 +2,51 @@
 使用 ORM 的新聞爬蟲基礎類別
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
 import requests
-from bs4 import BeautifulSoup
-import time
-import random
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
+from urllib.parse import urlparse
 import logging
 
 # 導入 資料庫工廠
 from db.database_factory import get_database
+from .rate_limiter import get_bucket
+
+# 所有爬蟲共用的日誌格式
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# 所有爬蟲共用的請求標頭（要求壓縮傳輸，requests 會自動解壓）
+_DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive',
+}
 
 
 class BaseNewsScraper(ABC):
     """新聞爬蟲的抽象基礎類別，使用 ORM 進行資料庫操作"""
     
+    # BeautifulSoup 解析器 (lxml 以 C 實作)，需要 html.parser 容錯行為的子類別可覆寫
+    parser = 'lxml'
+    
+    # 列表頁面解析器：'selectolax' 時列表頁以 selectolax LexborHTMLParser 解析
+    # (只取連結與標題時比建立 BeautifulSoup 樹快)，其餘沿用 BeautifulSoup
+    list_parser = 'bs4'
+    
+    # 對同一主機的每秒請求數上限（同主機的所有執行緒共用）
+    requests_per_second = 2.0
+    
+    # 資料庫欄位預設值（缺少的欄位以空字串補齊）
+    _DB_DEFAULTS = {'news_id': '', 'title': '', 'url': '', 'author': '', 'publish_time': ''}
+    
     def __init__(self, base_url: str, news_source: str, max_retry: int = 3):
         """
         初始化爬蟲
@@ -24,70 +54,175 @@ class BaseNewsScraper(ABC):
         Args:
             base_url: 新聞網站的基本URL
             news_source: 新聞來源標識 (如 'SETN', 'LTN', 'TVBS', 'ChinaTimes')
-            max_retry: 最大重試次數
+            max_retry: 最大重試次數（連線錯誤與 429/5xx 回應）
         """
         self.base_url = base_url
         self.news_source = news_source
         self.max_retry = max_retry
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
         
-        # 設定日誌
+        # 連線池與重試策略：重複使用 keep-alive 連線，暫時性錯誤以指數退避自動重試
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=max_retry,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET', 'HEAD']
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(_DEFAULT_HEADERS)
+        
+        # 設定日誌（同名 logger 為同一實例，只在首次建立時添加處理器，避免重複輸出）
         self.logger = logging.getLogger(f"{news_source}Scraper")
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(_LOG_FORMATTER)
+            self.logger.addHandler(handler)
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+        
+        # 詳細頁面同時抓取的數量上限
+        self.detail_concurrency = 4
+        self._detail_executor: Optional[ThreadPoolExecutor] = None
+        
+        # 依主機限速，取代每個請求後固定的隨機延遲
+        self.rate_limiter = get_bucket(urlparse(base_url).netloc, self.requests_per_second)
         
-        # 設定爬蟲延遲
-        self.delay_range = (1, 3)
+        # 本次爬取的開始時間（缺少發布時間時的預設值）
+        self._mark_run_start()
         
         # 初始化資料庫
         self.db = get_database()
     
-    def _get_page_content(self, url: str) -> Optional[BeautifulSoup]:
+    def _get_page_content(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
         獲取網頁內容
         
         Args:
             url: 目標URL
+            parse_only: 只需頁面中部分元素時傳入 SoupStrainer，只為符合的元素建立樹
             
         Returns:
             BeautifulSoup: 解析後的網頁內容，失敗時返回 None
         """
-        for attempt in range(self.max_retry):
-            try:
-                self.logger.info(f"正在獲取頁面: {url} (嘗試 {attempt + 1}/{self.max_retry})")
-                
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
-                response.encoding = response.apparent_encoding
-                
-                return BeautifulSoup(response.text, 'html.parser')
-                
-            except requests.exceptions.RequestException as e:
-                self.logger.warning(f"獲取頁面失敗 (嘗試 {attempt + 1}/{self.max_retry}): {e}")
-                if attempt < self.max_retry - 1:
-                    time.sleep(2 ** attempt)  # 指數退避
-                
-        self.logger.error(f"無法獲取頁面內容: {url}")
-        return None
+        try:
+            self.logger.info(f"正在獲取頁面: {url}")
+            
+            # 重試由 session 掛載的 HTTPAdapter 處理
+            response = self.session.get(url, timeout=10)
+            response.raise_for_status()
+            
+            # 直接交由解析器處理原始位元組，避免 apparent_encoding 對整份內容做編碼偵測
+            return BeautifulSoup(response.content, self.parser, parse_only=parse_only,
+                                 from_encoding=self._declared_encoding(response))
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"無法獲取頁面內容: {url} - {e}")
+            return None
     
-    def _random_delay(self):
-        """隨機延遲，避免對目標網站造成壓力"""
-        delay = random.uniform(*self.delay_range)
-        time.sleep(delay)
+    def _get_list_tree(self, url: str) -> Optional[LexborHTMLParser]:
+        """
+        以 selectolax 獲取網頁內容
+        
+        Args:
+            url: 目標URL
+            
+        Returns:
+            LexborHTMLParser: 解析後的網頁內容，失敗時返回 None
+        """
+        try:
+            self.logger.info(f"正在獲取頁面: {url}")
+            
+            response = self.session.get(url, timeout=10)
+            response.raise_for_status()
+            
+            # lexbor 不偵測編碼，先依標頭宣告 (未宣告時為 UTF-8) 解碼再解析
+            return LexborHTMLParser(self._response_text(response))
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"無法獲取頁面內容: {url} - {e}")
+            return None
+    
+    def _get_list_page(self, url: str) -> Any:
+        """
+        獲取新聞列表頁面內容
+        
+        依 list_parser 解析為 BeautifulSoup 或 selectolax LexborHTMLParser；
+        列表來源為 JSON API 的子類別可覆寫，直接回傳解析後的資料，省去建立 HTML 樹的成本
+        
+        Args:
+            url: 列表頁面URL
+            
+        Returns:
+            Any: 交給 _get_news_list 的頁面內容，失敗時返回 None
+        """
+        if self.list_parser == 'selectolax':
+            return self._get_list_tree(url)
+        return self._get_page_content(url)
+    
+    @staticmethod
+    def _declared_encoding(response: requests.Response) -> Optional[str]:
+        """
+        取得回應標頭宣告的編碼
+        
+        未宣告 charset 時返回 None，交由解析器依 <meta charset> 判斷
+        (requests 對未宣告的 text/html 會預設為 ISO-8859-1，不可直接使用)
+        """
+        if 'charset=' not in response.headers.get('Content-Type', '').lower():
+            return None
+        return response.encoding
+    
+    @classmethod
+    def _response_text(cls, response: requests.Response) -> str:
+        """
+        取得回應的文字內容
+        
+        優先使用標頭宣告的編碼，未宣告時直接以 UTF-8 解碼，
+        不使用 response.text 對整份內容做 apparent_encoding 偵測
+        """
+        encoding = cls._declared_encoding(response) or 'utf-8'
+        try:
+            return response.content.decode(encoding, errors='replace')
+        except LookupError:
+            # 標頭宣告了未知的編碼名稱
+            return response.content.decode('utf-8', errors='replace')
+    
+    def _mark_run_start(self):
+        """
+        記錄爬取開始時間
+        
+        日期補齊與預設發布時間都以此為準，不在每篇新聞重新取得並格式化目前時間
+        """
+        self.run_time = datetime.now()
+        self.run_time_str = self.run_time.strftime('%Y-%m-%d %H:%M:%S')
+        self.run_date_str = self.run_time_str[:10]
+    
+    @staticmethod
+    def _fallback_news_id(news_url: str) -> str:
+        """
+        無法從URL解析出新聞ID時，以URL的雜湊值作為ID
+        
+        使用 blake2b 而非內建 hash()：字串的 hash() 每個行程隨機，
+        重新啟動後同一則新聞會得到不同ID，無法判斷是否已存在
+        """
+        return hashlib.blake2b(news_url.encode('utf-8'), digest_size=12).hexdigest()
+    
+    def _throttle(self):
+        """依主機請求速率等待，避免對目標網站造成壓力"""
+        self.rate_limiter.acquire()
     
     @abstractmethod
-    def _get_news_list(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _get_news_list(self, soup: Any) -> List[Dict[str, str]]:
         """
         從主頁面解析新聞列表
         
         Args:
-            soup: 主頁面的 BeautifulSoup 物件
+            soup: _get_list_page 回傳的頁面內容 (預設為 BeautifulSoup 物件，
+                  list_parser 為 'selectolax' 時為 LexborHTMLParser)
             
         Returns:
             List[Dict[str, str]]: 新聞列表，每項包含標題、URL等基本資訊
@@ -131,22 +266,8 @@ class BaseNewsScraper(ABC):
         Returns:
             Dict[str, Any]: 轉換後的資料庫格式資料
         """
-        # 預設實現：直接返回原資料並加上 news_source
-        db_data = news_data.copy()
-        db_data['news_source'] = self.news_source
-        
-        # 確保包含必要欄位
-        required_fields = ['news_id', 'title', 'url']
-        for field in required_fields:
-            if field not in db_data:
-                self.logger.warning(f"缺少必要欄位 {field}")
-                db_data[field] = ''
-        
-        # 設定預設值
-        db_data.setdefault('author', '')
-        db_data.setdefault('publish_time', '')
-        
-        return db_data
+        # 預設實現：以欄位預設值為底合併原資料，並加上 news_source
+        return {**self._DB_DEFAULTS, **news_data, 'news_source': self.news_source}
     
     def _save_news_to_db(self, news_data: Dict[str, Any]) -> bool:
         """
@@ -181,11 +302,116 @@ class BaseNewsScraper(ABC):
         """
         return self.db.news_exists(self.news_source, news_id)
     
+    def _get_existing_news_ids(self, news_ids: List[str]) -> Set[str]:
+        """
+        以單一查詢取得資料庫中已存在的新聞ID
+        
+        Args:
+            news_ids: 新聞ID列表
+            
+        Returns:
+            Set[str]: 已存在的新聞ID集合
+        """
+        return self.db.get_existing_news_ids(self.news_source, news_ids)
+    
+    def _should_process_news(self, news_item: Dict[str, Any]) -> bool:
+        """
+        檢查是否應該處理列表頁面上的這條新聞（在抓取詳細頁面之前）
+        預設全部處理，子類別可覆寫此方法加入過濾條件
+        
+        Args:
+            news_item: 列表頁面的新聞資料
+            
+        Returns:
+            bool: True 表示處理，False 表示跳過
+        """
+        return True
+    
+    def _should_keep_news(self, news_data: Dict[str, Any]) -> bool:
+        """
+        檢查合併詳細頁面資料後是否保留這條新聞
+        預設全部保留，子類別可覆寫此方法加入過濾條件
+        
+        Args:
+            news_data: 合併後的新聞資料
+            
+        Returns:
+            bool: True 表示保留，False 表示跳過
+        """
+        return True
+    
+    async def _get_news_detail_async(self, news_url: str) -> Optional[Dict[str, Any]]:
+        """
+        非同步獲取新聞詳細內容
+        預設在執行緒中執行同步版本的 _get_news_detail，子類別可覆寫為原生非同步實作
+        
+        Args:
+            news_url: 新聞詳細頁面URL
+            
+        Returns:
+            Dict[str, Any]: 新聞詳細資訊，失敗時返回 None
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_detail_executor(), self._get_news_detail, news_url)
+    
+    def _get_detail_executor(self) -> ThreadPoolExecutor:
+        """
+        取得抓取詳細頁面用的執行緒池
+        
+        跨頁面重複使用同一個執行緒池，不隨每次 asyncio.run 建立並關閉預設執行器
+        """
+        if self._detail_executor is None:
+            self._detail_executor = ThreadPoolExecutor(
+                max_workers=self.detail_concurrency,
+                thread_name_prefix=f"{self.news_source}Detail"
+            )
+        return self._detail_executor
+    
+    async def _fetch_news_details_async(self, news_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        並行獲取多條新聞的詳細內容，同時進行的請求數以 detail_concurrency 限制
+        
+        Args:
+            news_urls: 新聞詳細頁面URL列表
+            
+        Returns:
+            List: 與 news_urls 順序相同的詳細資訊列表，失敗的項目為 None
+        """
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+        
+        async def fetch(news_url: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                # 依主機請求速率排隊，等待期間不佔用其他主機的請求
+                await self.rate_limiter.acquire_async()
+                try:
+                    return await self._get_news_detail_async(news_url)
+                except Exception as e:
+                    self.logger.error(f"獲取新聞詳情失敗: {news_url} - {e}")
+                    return None
+        
+        return await asyncio.gather(*(fetch(news_url) for news_url in news_urls))
+    
+    def _fetch_news_details(self, news_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        並行獲取多條新聞的詳細內容（同步介面）
+        
+        Args:
+            news_urls: 新聞詳細頁面URL列表
+            
+        Returns:
+            List: 與 news_urls 順序相同的詳細資訊列表，失敗的項目為 None
+        """
+        if not news_urls:
+            return []
+        return asyncio.run(self._fetch_news_details_async(news_urls))
+    
     def scrape_news(self, max_pages: int = 1, skip_existing: bool = True, 
                    max_consecutive_duplicates: int = 5) -> Dict[str, int]:
         """
         執行新聞爬取 - 使用批量插入提高效率
         
+        每頁先依序過濾出需要處理的新聞，再並行抓取其詳細頁面
+        
         Args:
             max_pages: 最大爬取頁數
             skip_existing: 是否跳過已存在的新聞
@@ -197,6 +423,8 @@ class BaseNewsScraper(ABC):
         stats = {'total': 0, 'new': 0, 'skipped': 0, 'failed': 0}
         collected_news = []  # 收集所有新聞資料，準備批量插入
         consecutive_duplicates = 0  # 連續重複計數器
+        seen_ids = set()  # 本次爬取已處理過的新聞ID
+        self._mark_run_start()
         
         self.logger.info(f"開始爬取 {self.news_source} 新聞，最多 {max_pages} 頁，最大連續重複: {max_consecutive_duplicates}")
         
@@ -206,9 +434,9 @@ class BaseNewsScraper(ABC):
                 
                 # 獲取新聞列表頁面
                 page_url = self._get_page_url(page)
-                soup = self._get_page_content(page_url)
+                soup = self._get_list_page(page_url)
                 
-                if not soup:
+                if soup is None:
                     self.logger.error(f"無法獲取第 {page} 頁內容")
                     continue
                 
@@ -221,7 +449,15 @@ class BaseNewsScraper(ABC):
                     self.logger.info(f"第 {page} 頁沒有找到新聞，停止爬取")
                     break
                 
-                page_new_news = 0  # 當前頁面新增的新聞數
+                # 整頁的新聞ID一次查詢是否已存在，避免逐筆往返資料庫
+                existing_ids = set()
+                if skip_existing:
+                    page_news_ids = [self._extract_news_id(item['url']) for item in news_list if item.get('url')]
+                    existing_ids = self._get_existing_news_ids(page_news_ids)
+                
+                # 第一階段：依序過濾，決定需要抓取詳細頁面的新聞
+                candidates = []  # (列表資料, 新聞ID, 新聞URL)
+                reached_duplicate_limit = False
                 
                 for news_item in news_list:
                     stats['total'] += 1
@@ -233,15 +469,21 @@ class BaseNewsScraper(ABC):
                             continue
                         
                         # 檢查是否應該處理這條新聞（子類別可覆寫）
-                        if hasattr(self, '_should_process_news') and not self._should_process_news(news_item):
+                        if not self._should_process_news(news_item):
                             stats['skipped'] += 1
                             continue
                         
                         # 提取新聞ID
                         news_id = self._extract_news_id(news_url)
                         
+                        # 列表中重複出現（或已在前幾頁出現）的新聞只處理一次
+                        if news_id in seen_ids:
+                            stats['skipped'] += 1
+                            continue
+                        seen_ids.add(news_id)
+                        
                         # 檢查是否已存在
-                        if skip_existing and self._is_news_exists(news_id):
+                        if skip_existing and news_id in existing_ids:
                             stats['skipped'] += 1
                             consecutive_duplicates += 1
                             self.logger.debug(f"跳過已存在的新聞: {news_id} (連續重複: {consecutive_duplicates})")
@@ -249,15 +491,26 @@ class BaseNewsScraper(ABC):
                             # 檢查是否超過連續重複限制
                             if consecutive_duplicates >= max_consecutive_duplicates:
                                 self.logger.info(f"連續 {consecutive_duplicates} 條重複新聞，停止爬取")
-                                return self._finalize_scraping(stats, collected_news)
+                                reached_duplicate_limit = True
+                                break
                             
                             continue
                         
                         # 重置連續重複計數器（找到新新聞）
                         consecutive_duplicates = 0
+                        candidates.append((news_item, news_id, news_url))
                         
-                        # 獲取新聞詳細內容
-                        news_detail = self._get_news_detail(news_url)
+                    except Exception as e:
+                        stats['failed'] += 1
+                        self.logger.error(f"處理新聞時發生錯誤: {e}")
+                
+                # 第二階段：並行獲取新聞詳細內容
+                news_details = self._fetch_news_details([news_url for _, _, news_url in candidates])
+                
+                page_new_news = 0  # 當前頁面新增的新聞數
+                
+                for (news_item, news_id, news_url), news_detail in zip(candidates, news_details):
+                    try:
                         if not news_detail:
                             stats['failed'] += 1
                             continue
@@ -270,6 +523,11 @@ class BaseNewsScraper(ABC):
                         merged_data['news_id'] = news_id
                         merged_data['url'] = news_url
                         
+                        # 合併後的資料再檢查一次（子類別可覆寫）
+                        if not self._should_keep_news(merged_data):
+                            stats['skipped'] += 1
+                            continue
+                        
                         # 轉換為資料庫格式並收集
                         db_data = self._convert_to_db_format(merged_data)
                         collected_news.append(db_data)
@@ -277,9 +535,6 @@ class BaseNewsScraper(ABC):
                         
                         self.logger.debug(f"收集新聞: {merged_data.get('title', 'Unknown')[:50]}")
                         
-                        # 隨機延遲
-                        self._random_delay()
-                        
                     except Exception as e:
                         stats['failed'] += 1
                         self.logger.error(f"處理新聞時發生錯誤: {e}")
@@ -290,9 +545,12 @@ class BaseNewsScraper(ABC):
                 else:
                     self.logger.info(f"第 {page} 頁沒有新增新聞")
                 
+                if reached_duplicate_limit:
+                    break
+                
                 # 頁面間延遲
                 if page < max_pages:
-                    self._random_delay()
+                    self._throttle()
                     
             except Exception as e:
                 self.logger.error(f"爬取第 {page} 頁時發生錯誤: {e}")
@@ -347,3 +605,8 @@ class BaseNewsScraper(ABC):
         """清理資源"""
         if hasattr(self, 'session'):
             self.session.close()
+        
+        # 詳細頁執行緒池於下次抓取時重新建立
+        if getattr(self, '_detail_executor', None) is not None:
+            self._detail_executor.shutdown(wait=False)
+            self._detail_executor = None
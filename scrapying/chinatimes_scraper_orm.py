@@ -7,17 +7,44 @@ import os
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+import soupsieve as sv
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin
 
 # 添加根目錄到Python路徑
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from .base_scraper_orm import BaseNewsScraper
 
+# 時間與作者解析用的正則表達式（模組載入時編譯一次）
+_MIXED_TIME_PATTERN = re.compile(r'(\d{2}:\d{2})(\d{4}/\d{2}/\d{2})')  # 11:452025/08/27
+_AUTHOR_DATE_PATTERN = re.compile(r'\d{4}/\d{1,2}/\d{1,2}.*')
+_AUTHOR_TIME_PATTERN = re.compile(r'\d{2}:\d{2}.*')
+_REPORTER_PATTERN = re.compile(r'記者([^／\s\n]+)')
+_VALID_URL_PATTERN = re.compile(r'/(?:newspapers|realtimenews|politic)/')
+
 
 class ChinaTimesScraper(BaseNewsScraper):
     """中國時報新聞爬蟲 - 使用ORM版本"""
     
+    # 列表頁只取標題與連結，使用 selectolax 解析
+    list_parser = 'selectolax'
+    
+    # 預先編譯的 CSS 選擇器（類別載入時編譯一次，不在每篇文章重新解析）
+    _SELECTORS = {
+        'title': sv.compile('h1.article-title, .articletitle h1'),
+        'author': tuple(sv.compile(selector) for selector in (
+            '.author',
+            '.reporter',
+            '[class*="author"]',
+            '.article-author',
+            '.byline'
+        )),
+        'time_datetime': sv.compile('time[datetime]'),
+        'meta_published': sv.compile('meta[property="article:published_time"]'),
+        'time': sv.compile('time'),
+    }
+    
     def __init__(self):
         super().__init__(
             base_url="https://www.chinatimes.com/politic/?chdtv",
@@ -25,18 +52,18 @@ class ChinaTimesScraper(BaseNewsScraper):
             max_retry=3
         )
     
-    def _get_news_list(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _get_news_list(self, tree: LexborHTMLParser) -> List[Dict[str, str]]:
         """從主頁面解析新聞列表"""
         news_list = []
         
         try:
             # 查找新聞項目
-            news_items = soup.select('h3.title a, .articletitle a')
+            news_items = tree.css('h3.title a, .articletitle a')
             
             for item in news_items:
                 try:
-                    title = item.get_text(strip=True)
-                    url = item.get('href')
+                    title = item.text(strip=True)
+                    url = item.attributes.get('href')
                     
                     if url:
                         # 處理相對URL
@@ -76,7 +103,7 @@ class ChinaTimesScraper(BaseNewsScraper):
             publish_time = self._extract_publish_time(soup)
             
             # 提取標題（如果主頁面沒有獲取到）
-            title_elem = soup.select_one('h1.article-title, .articletitle h1')
+            title_elem = self._SELECTORS['title'].select_one(soup)
             title = title_elem.get_text(strip=True) if title_elem else ""
             
             return {
@@ -103,9 +130,9 @@ class ChinaTimesScraper(BaseNewsScraper):
                         clean_id = part.split('?')[0].split('#')[0]
                         return clean_id
             
-            return str(hash(news_url))
+            return self._fallback_news_id(news_url)
         except:
-            return str(hash(news_url))
+            return self._fallback_news_id(news_url)
     
     def _convert_to_db_format(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
         """轉換為資料庫格式"""
@@ -121,15 +148,25 @@ class ChinaTimesScraper(BaseNewsScraper):
         """統一日期格式，處理 ChinaTimes 的各種時間格式"""
         try:
             if not date_str:
-                return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                return self.run_time_str
             
-            # 處理 ISO 8601 格式 (2025-08-27T11:45:34+08:00)
+            # 已是標準格式 (2025-08-27 11:45:34)：詳細頁面解析後轉換資料庫格式時會再次經過此處
+            if len(date_str) == 19 and date_str[4] == '-' and date_str[10] == ' ' and date_str[16] == ':':
+                return date_str
+            
+            # 處理 ISO 8601 格式 (2025-08-27T11:45:34+08:00)：直接切片組成輸出字串，不建立 datetime
+            if len(date_str) >= 19 and date_str[4] == '-' and date_str[10] == 'T' and date_str[16] == ':':
+                return f"{date_str[:10]} {date_str[11:19]}"
+            
+            # 其他 ISO 8601 變體（例如沒有秒數）
             if 'T' in date_str and '+' in date_str:
                 # 解析 ISO 格式
                 dt = datetime.fromisoformat(date_str.replace('+08:00', ''))
                 return dt.strftime('%Y-%m-%d %H:%M:%S')
             
             # 處理 datetime 屬性格式 (2025-08-27 11:45)
+            if len(date_str) == 16 and date_str[4] == '-' and date_str[10] == ' ' and date_str[13] == ':':
+                return f"{date_str}:00"
             if '-' in date_str and ':' in date_str and len(date_str.split()) == 2:
                 date_part, time_part = date_str.split()
                 if len(time_part.split(':')) == 2:
@@ -141,13 +178,12 @@ class ChinaTimesScraper(BaseNewsScraper):
                 normalized = date_str.replace('/', '-')
                 # 如果只有日期，添加當前時間
                 if ':' not in normalized:
-                    current_time = datetime.now().strftime('%H:%M:%S')
+                    current_time = self.run_time_str[11:]
                     return f"{normalized} {current_time}"
                 return normalized
             
             # 處理混合格式 (11:452025/08/27)
-            import re
-            match = re.match(r'(\d{2}:\d{2})(\d{4}/\d{2}/\d{2})', date_str)
+            match = _MIXED_TIME_PATTERN.match(date_str)
             if match:
                 time_part = match.group(1)
                 date_part = match.group(2).replace('/', '-')
@@ -156,31 +192,22 @@ class ChinaTimesScraper(BaseNewsScraper):
             return date_str
         except Exception as e:
             self.logger.warning(f"日期格式化失敗: {date_str}, 錯誤: {e}")
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return self.run_time_str
     
     def _is_valid_news_url(self, url: str) -> bool:
         """檢查是否為有效的新聞URL"""
         try:
             # 檢查是否包含新聞路徑和時間戳
-            valid_paths = ['/newspapers/', '/realtimenews/', '/politic/']
-            return any(path in url for path in valid_paths)
+            return _VALID_URL_PATTERN.search(url) is not None
         except:
             return False
     
     def _extract_author(self, soup: BeautifulSoup) -> Optional[str]:
         """提取作者信息"""
         try:
-            # 尋找作者相關標籤
-            author_selectors = [
-                '.author',
-                '.reporter',
-                '[class*="author"]',
-                '.article-author',
-                '.byline'
-            ]
-            
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
+            # 依序嘗試作者相關標籤
+            for selector in self._SELECTORS['author']:
+                author_elem = selector.select_one(soup)
                 if author_elem:
                     author_text = author_elem.get_text(strip=True)
                     # 清理作者文字
@@ -199,12 +226,12 @@ class ChinaTimesScraper(BaseNewsScraper):
             cleaned = author_text
             
             # 移除時間信息
-            cleaned = re.sub(r'\d{4}/\d{1,2}/\d{1,2}.*', '', cleaned)
-            cleaned = re.sub(r'\d{2}:\d{2}.*', '', cleaned)
+            cleaned = _AUTHOR_DATE_PATTERN.sub('', cleaned)
+            cleaned = _AUTHOR_TIME_PATTERN.sub('', cleaned)
             
             # 提取記者姓名
             if '記者' in cleaned:
-                match = re.search(r'記者([^／\s\n]+)', cleaned)
+                match = _REPORTER_PATTERN.search(cleaned)
                 if match:
                     return match.group(1).strip()
             
@@ -216,21 +243,21 @@ class ChinaTimesScraper(BaseNewsScraper):
         """提取發布時間"""
         try:
             # 1. 優先從time標籤的datetime屬性獲取
-            time_elem = soup.select_one('time[datetime]')
+            time_elem = self._SELECTORS['time_datetime'].select_one(soup)
             if time_elem:
                 datetime_str = time_elem.get('datetime')
                 if datetime_str and isinstance(datetime_str, str):
                     return self._normalize_date_format(datetime_str)
             
             # 2. 從meta標籤獲取發布時間
-            meta_published = soup.select_one('meta[property="article:published_time"]')
+            meta_published = self._SELECTORS['meta_published'].select_one(soup)
             if meta_published:
                 content = meta_published.get('content')
                 if content and isinstance(content, str):
                     return self._normalize_date_format(content)
             
             # 3. 從time標籤文字內容提取（作為備選）
-            time_elem = soup.select_one('time')
+            time_elem = self._SELECTORS['time'].select_one(soup)
             if time_elem:
                 time_text = time_elem.get_text(strip=True)
                 if time_text:
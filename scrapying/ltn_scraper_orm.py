@@ -7,14 +7,43 @@ import os
 import json
 import re
 import requests
-from datetime import datetime
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 # 添加根目錄到Python路徑
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from .base_scraper_orm import BaseNewsScraper
 
+# 記者署名格式（模組載入時編譯一次，不在每篇文章重新查詢 re 快取）
+_REPORTER_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"〔記者(.*?)／(.*?)報導〕",   # 〔記者XXX／地點報導〕
+    r"〔記者(.*?)／",             # 〔記者XXX／
+    r"記者(.*?)／(.*?)報導",       # 記者XXX／地點報導
+    r"記者(.*?)／",               # 記者XXX／
+    r"記者(.*?)攝",               # 記者XXX攝
+    r"(.*?)攝\）",                # XXX攝）
+    r"(.*?)攝",                   # XXX攝
+    r"採訪(.*?)／",               # 採訪XXX／
+    r"撰稿(.*?)／",               # 撰稿XXX／
+    r"編譯(.*?)／",               # 編譯XXX／
+    r"綜合報導\/(.*?)報導",       # 綜合報導/XXX報導
+    r"文\/(.*?)記者",             # 文/XXX記者
+    r"文\/(.*?)\s",               # 文/XXX（空格結尾）
+))
+_BASIC_REPORTER_PATTERNS = (
+    re.compile(r'〔記者([^／]+)'),
+    re.compile(r'記者([^／]+)'),
+)
+_CHINESE_NAME_PATTERN = re.compile(r'^[\u4e00-\u9fff]{2,4}$')  # 2-4 個字的中文姓名
+_NAME_SUFFIX_PATTERN = re.compile(r'[攝影、攝報導）\)]+.*$')
+_PARENTHESES_PATTERN = re.compile(r'\(.*?\)')
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_META_STRAINER = SoupStrainer('meta')
+_JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE
+)
+
 
 class LTNScraper(BaseNewsScraper):
     """LTN新聞爬蟲 - 使用ORM版本"""
@@ -30,13 +59,22 @@ class LTNScraper(BaseNewsScraper):
         """獲取指定頁面的URL"""
         return f"https://news.ltn.com.tw/ajax/breakingnews/politics/{page}"
     
-    def _get_news_list(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
-        """從主頁面解析新聞列表 (LTN返回JSON格式)"""
+    def _get_list_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """獲取新聞列表 (LTN API 返回JSON格式，直接解析不經過 BeautifulSoup)"""
         try:
-            # LTN API 返回JSON格式，soup.get_text()獲取原始文本
-            json_text = soup.get_text()
-            data = json.loads(json_text)
+            self.logger.info(f"正在獲取頁面: {url}")
+            
+            response = self.session.get(url, timeout=10)
+            response.raise_for_status()
+            return response.json()
             
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.logger.error(f"無法獲取頁面內容: {url} - {e}")
+            return None
+    
+    def _get_news_list(self, data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """從列表API回應解析新聞列表"""
+        try:
             if not data or "data" not in data:
                 return []
             
@@ -98,9 +136,9 @@ class LTNScraper(BaseNewsScraper):
             if 'breakingnews/' in news_url:
                 return news_url.split('breakingnews/')[-1]
             else:
-                return str(hash(news_url))
+                return self._fallback_news_id(news_url)
         except:
-            return str(hash(news_url))
+            return self._fallback_news_id(news_url)
     
     def _convert_to_db_format(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
         """轉換為資料庫格式"""
@@ -118,19 +156,16 @@ class LTNScraper(BaseNewsScraper):
             # 處理LTN的時間格式
             if ':' in date_str and len(date_str) <= 6:  # 格式如 "13:53"
                 # 只有時間沒有日期，添加今天的日期
-                today_date = datetime.now().strftime("%Y-%m-%d")
-                return f"{today_date} {date_str}:00"  # 添加秒數
+                return f"{self.run_date_str} {date_str}:00"  # 添加秒數
             elif '/' in date_str:
                 # 替換 / 為 -
                 normalized = date_str.replace('/', '-')
                 
                 # 如果只有時間沒有日期，添加今天的日期  
                 if ' ' not in normalized:
-                    today_date = datetime.now().strftime("%Y-%m-%d")
-                    normalized = f"{today_date} {normalized}"
+                    normalized = f"{self.run_date_str} {normalized}"
                 elif normalized.count('-') == 1:  # MM-DD HH:MM 格式
-                    current_year = datetime.now().year
-                    normalized = f"{current_year}-{normalized}"
+                    normalized = f"{self.run_time.year}-{normalized}"
                 
                 return normalized
             
@@ -181,26 +216,10 @@ class LTNScraper(BaseNewsScraper):
     def _extract_reporter_names_from_html(self, html_content: str) -> Optional[str]:
         """從HTML內容中提取記者名稱"""
         try:
-            # 使用多種正則表達式模式提取記者資訊，包含更多格式
-            patterns = [
-                r"〔記者(.*?)／(.*?)報導〕",   # 〔記者XXX／地點報導〕
-                r"〔記者(.*?)／",             # 〔記者XXX／
-                r"記者(.*?)／(.*?)報導",       # 記者XXX／地點報導
-                r"記者(.*?)／",               # 記者XXX／
-                r"記者(.*?)攝",               # 記者XXX攝
-                r"(.*?)攝\）",                # XXX攝）
-                r"(.*?)攝",                   # XXX攝
-                r"採訪(.*?)／",               # 採訪XXX／
-                r"撰稿(.*?)／",               # 撰稿XXX／
-                r"編譯(.*?)／",               # 編譯XXX／
-                r"綜合報導\/(.*?)報導",       # 綜合報導/XXX報導
-                r"文\/(.*?)記者",             # 文/XXX記者
-                r"文\/(.*?)\s",               # 文/XXX（空格結尾）
-            ]
-            
             all_matches = []
-            for pattern in patterns:
-                matches = re.findall(pattern, html_content)
+            # 使用多種正則表達式模式提取記者資訊，包含更多格式
+            for pattern in _REPORTER_PATTERNS:
+                matches = pattern.findall(html_content)
                 if matches:
                     # 處理包含元組的匹配結果
                     for match in matches:
@@ -218,12 +237,12 @@ class LTNScraper(BaseNewsScraper):
                     for name in match.split("、"):
                         clean_name = name.strip()
                         # 去除常見的後綴（攝影、攝、報導等）和括弧
-                        clean_name = re.sub(r'[攝影、攝報導）\)]+.*$', '', clean_name)
-                        clean_name = re.sub(r'\(.*?\)', '', clean_name)  # 去除括弧內容
+                        clean_name = _NAME_SUFFIX_PATTERN.sub('', clean_name)
+                        clean_name = _PARENTHESES_PATTERN.sub('', clean_name)  # 去除括弧內容
                         clean_name = clean_name.strip()
                         
                         # 只保留中文姓名（2-4個字符）
-                        if re.match(r'^[\u4e00-\u9fff]{2,4}$', clean_name):
+                        if _CHINESE_NAME_PATTERN.match(clean_name):
                             names.add(clean_name)
                 
                 if names:
@@ -236,17 +255,13 @@ class LTNScraper(BaseNewsScraper):
                 line = line.strip()
                 if line.startswith('〔記者') or line.startswith('記者'):
                     # 清理HTML標籤
-                    clean_line = re.sub(r'<[^>]+>', '', line)
+                    clean_line = _HTML_TAG_PATTERN.sub('', line)
                     # 使用基本模式提取
-                    basic_patterns = [
-                        r'〔記者([^／]+)',
-                        r'記者([^／]+)'
-                    ]
-                    for pattern in basic_patterns:
-                        match = re.search(pattern, clean_line)
+                    for pattern in _BASIC_REPORTER_PATTERNS:
+                        match = pattern.search(clean_line)
                         if match:
                             name = match.group(1).strip()
-                            if re.match(r'^[\u4e00-\u9fff]{2,4}$', name):
+                            if _CHINESE_NAME_PATTERN.match(name):
                                 return name
             
             return None
@@ -263,7 +278,7 @@ class LTNScraper(BaseNewsScraper):
                 self.logger.warning(f"無法獲取頁面內容: {news_url}")
                 return None
             
-            html_content = response.text
+            html_content = self._response_text(response)
             return self._extract_reporter_names_from_html(html_content)
             
         except Exception as e:
@@ -278,7 +293,7 @@ class LTNScraper(BaseNewsScraper):
                 self.logger.warning(f"無法獲取頁面內容: {news_url}")
                 return None
             
-            html_content = response.text
+            html_content = self._response_text(response)
             
             # 方法1: 從HTML內容直接提取
             author = self._extract_reporter_names_from_html(html_content)
@@ -304,12 +319,8 @@ class LTNScraper(BaseNewsScraper):
     def _extract_reporter_from_json_ld(self, html_content: str) -> Optional[str]:
         """從JSON-LD結構化資料中提取記者資訊"""
         try:
-            import json
-            import re
-            
             # 尋找JSON-LD標籤
-            json_ld_pattern = r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>'
-            json_matches = re.findall(json_ld_pattern, html_content, re.DOTALL | re.IGNORECASE)
+            json_matches = _JSON_LD_PATTERN.findall(html_content)
             
             for json_text in json_matches:
                 try:
@@ -342,10 +353,8 @@ class LTNScraper(BaseNewsScraper):
     def _extract_reporter_from_meta(self, html_content: str) -> Optional[str]:
         """從meta標籤中提取記者資訊"""
         try:
-            import re
-            from bs4 import BeautifulSoup
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # 只需要 meta 標籤，不為文章其餘內容建立樹
+            soup = BeautifulSoup(html_content, self.parser, parse_only=_META_STRAINER)
             
             # 檢查各種meta標籤
             meta_tags = soup.find_all('meta')
@@ -365,7 +374,7 @@ class LTNScraper(BaseNewsScraper):
                     if content:
                         # 如果直接是作者名稱
                         clean_name = content.strip()
-                        if re.match(r'^[\u4e00-\u9fff]{2,4}$', clean_name):
+                        if _CHINESE_NAME_PATTERN.match(clean_name):
                             return clean_name
             
             return None
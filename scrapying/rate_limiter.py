@@ -0,0 +1,63 @@
+"""
+爬蟲請求限速模組
+以權杖桶 (token bucket) 限制每個主機的請求速率，同一主機的所有爬蟲執行緒共用
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """執行緒安全的權杖桶限速器，可同時用於同步與非同步呼叫端"""
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: 每秒補充的權杖數 (即穩定狀態下的每秒請求數)
+            capacity: 權杖桶容量 (允許的瞬間突發請求數)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """預約一個權杖，回傳取得前需要等待的秒數"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 權杖不足時先扣成負值，排在後面的呼叫端等待時間依序遞增
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        """同步取得權杖（阻塞目前執行緒）"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """非同步取得權杖，等待期間事件迴圈可處理其他請求"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# 主機 -> 權杖桶
+_BUCKETS: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host: str, rate: float, capacity: float = 1.0) -> TokenBucket:
+    """取得指定主機的權杖桶，首次呼叫時以給定速率建立"""
+    with _buckets_lock:
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _BUCKETS[host] = TokenBucket(rate, capacity)
+        return bucket
@@ -7,41 +7,66 @@ import os
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+import soupsieve as sv
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse, parse_qs
 
 from .base_scraper_orm import BaseNewsScraper
 
+# 作者署名格式（依優先順序）
+_AUTHOR_PATTERNS = (
+    re.compile(r'記者(\S+)／\S+報導'),    # "記者陳怡潔／台北報導"
+    re.compile(r'政治中心／(\S+)報導'),     # "政治中心／張家寧報導"
+    re.compile(r'文、圖／(\S+)'),         # "文、圖／鏡週刊"
+    re.compile(r'圖、文／(\S+)'),         # "圖、文／鏡週刊"
+    re.compile(r'文／(\S+)'),            # "文／記者名"
+    re.compile(r'文／\S+／(\S+)'),        # "文／住展雜誌／陳曼羚"
+)
+
 
 class SETNScraper(BaseNewsScraper):
     """SETN新聞爬蟲 - 使用ORM版本"""
     
+    # 列表頁只取標題、連結與時間，使用 selectolax 解析
+    list_parser = 'selectolax'
+    
+    # 預先編譯的 CSS 選擇器（類別載入時編譯一次，不在每篇文章重新解析）
+    _SELECTORS = {
+        'detail_title': sv.compile('h1.news-title-3, .news-title, h1'),
+        'detail_time': tuple(sv.compile(selector) for selector in (
+            'time.news-flash-date',
+            'time[datetime]',
+            '.publish-time',
+            '.news-time'
+        )),
+    }
+    
     def __init__(self):
         super().__init__(
             base_url="https://www.setn.com/ViewAll.aspx?PageGroupID=6",
             news_source="SETN",
             max_retry=3
         )
-        self.current_year = datetime.now().year
     
     def _get_page_url(self, page: int) -> str:
         """獲取指定頁面的URL"""
         return f"https://www.setn.com/ViewAll.aspx?PageGroupID=6&p={page}"
     
-    def _get_news_list(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _get_news_list(self, tree: LexborHTMLParser) -> List[Dict[str, str]]:
         """從主頁面解析新聞列表"""
         news_list = []
         
         try:
             # 尋找新聞項目
-            for item in soup.find_all('div', class_='col-sm-12 newsItems'):
+            for item in tree.css('div[class="col-sm-12 newsItems"]'):
                 try:
-                    link_tag = item.find('a', href=True, class_='gt')
-                    time_tag = item.find('time')
+                    link_tag = item.css_first('a.gt[href]')
+                    time_tag = item.css_first('time')
                     
-                    if link_tag and time_tag:
-                        title = link_tag.get_text(strip=True)
-                        relative_url = link_tag['href']
+                    if link_tag is not None and time_tag is not None:
+                        title = link_tag.text(strip=True)
+                        relative_url = link_tag.attributes['href']
                         
                         # 建構完整URL
                         full_url = urljoin("https://www.setn.com/", relative_url)
@@ -50,7 +75,7 @@ class SETNScraper(BaseNewsScraper):
                         cleaned_url = self._clean_url(full_url)
                         
                         # 處理時間格式
-                        time_text = time_tag.get_text(strip=True)
+                        time_text = time_tag.text(strip=True)
                         
                         news_info = {
                             "title": title,
@@ -80,7 +105,7 @@ class SETNScraper(BaseNewsScraper):
             author = self._extract_author(soup)
             
             # 從詳細頁面提取標題（作為備用）
-            title_elem = soup.select_one('h1.news-title-3, .news-title, h1')
+            title_elem = self._SELECTORS['detail_title'].select_one(soup)
             detail_title = title_elem.get_text(strip=True) if title_elem else ""
             
             # 提取發布時間（從新聞內容頁面）
@@ -122,129 +147,17 @@ class SETNScraper(BaseNewsScraper):
             if 'NewsID=' in news_url:
                 return news_url.split('NewsID=')[-1]
             else:
-                return str(hash(news_url))
+                return self._fallback_news_id(news_url)
         except:
-            return str(hash(news_url))
+            return self._fallback_news_id(news_url)
     
     def scrape_news(self, max_pages: int = 1, skip_existing: bool = True, 
                    max_consecutive_duplicates: int = 5) -> Dict[str, int]:
         """
-        執行新聞爬取 - SETN 專用，只抓取當天新聞，支持連續重複檢查
-        
-        Args:
-            max_pages: 最大爬取頁數
-            skip_existing: 是否跳過已存在的新聞
-            max_consecutive_duplicates: 最大連續重複新聞數量，超過時停止爬取
-            
-        Returns:
-            Dict[str, int]: 統計資訊 {'total': 總數, 'new': 新增數, 'skipped': 跳過數, 'failed': 失敗數}
+        執行新聞爬取 - SETN 只抓取當天新聞，過濾邏輯見 _should_process_news / _should_keep_news
         """
-        stats = {'total': 0, 'new': 0, 'skipped': 0, 'failed': 0}
-        collected_news = []  # 收集所有新聞資料，準備批量插入
-        consecutive_duplicates = 0  # 連續重複計數器
-        
-        self.logger.info(f"開始爬取 {self.news_source} 新聞（只抓取當天），最多 {max_pages} 頁，最大連續重複: {max_consecutive_duplicates}")
-        
-        for page in range(1, max_pages + 1):
-            try:
-                self.logger.info(f"正在爬取第 {page} 頁")
-                
-                # 獲取新聞列表頁面
-                page_url = self._get_page_url(page)
-                soup = self._get_page_content(page_url)
-                
-                if not soup:
-                    self.logger.error(f"無法獲取第 {page} 頁內容")
-                    continue
-                
-                # 解析新聞列表
-                news_list = self._get_news_list(soup)
-                self.logger.info(f"第 {page} 頁找到 {len(news_list)} 條新聞")
-                
-                if not news_list:
-                    self.logger.warning(f"第 {page} 頁沒有找到新聞")
-                    break
-                
-                page_new_news = 0  # 當前頁面新增的新聞數
-                
-                # 處理每條新聞
-                for news_item in news_list:
-                    try:
-                        stats['total'] += 1
-                        
-                        # 先檢查時間是否為當天（SETN 特殊邏輯）
-                        if not self._should_process_news(news_item):
-                            stats['skipped'] += 1
-                            continue
-                        
-                        news_url = news_item.get('url', '')
-                        if not news_url:
-                            stats['failed'] += 1
-                            continue
-                        
-                        # 提取新聞ID
-                        news_id = self._extract_news_id(news_url)
-                        
-                        # 檢查是否已存在
-                        if skip_existing and self._is_news_exists(news_id):
-                            stats['skipped'] += 1
-                            consecutive_duplicates += 1
-                            self.logger.debug(f"跳過已存在的新聞: {news_id} (連續重複: {consecutive_duplicates})")
-                            
-                            # 檢查是否超過連續重複限制
-                            if consecutive_duplicates >= max_consecutive_duplicates:
-                                self.logger.info(f"連續 {consecutive_duplicates} 條重複新聞，停止爬取")
-                                return self._finalize_scraping(stats, collected_news)
-                            
-                            continue
-                        
-                        # 重置連續重複計數器（找到新新聞）
-                        consecutive_duplicates = 0
-                        
-                        # 獲取新聞詳細內容
-                        news_detail = self._get_news_detail(news_url)
-                        if not news_detail:
-                            stats['failed'] += 1
-                            continue
-                        
-                        # 合併主頁面和詳細頁面的資料
-                        merged_data = news_item.copy()  # 先複製主頁面資料
-                        merged_data.update(news_detail)  # 再更新詳細頁面資料
-                        
-                        # 加上基本資訊
-                        merged_data['news_id'] = news_id
-                        merged_data['url'] = news_url
-                        
-                        # 再次檢查處理後的時間（雙重保險）
-                        if not self._should_process_news(merged_data):
-                            stats['skipped'] += 1
-                            continue
-                        
-                        # 轉換為資料庫格式並收集
-                        db_data = self._convert_to_db_format(merged_data)
-                        collected_news.append(db_data)
-                        page_new_news += 1
-                        
-                        self.logger.debug(f"收集新聞: {merged_data.get('title', 'Unknown')[:50]}")
-                        
-                        # 隨機延遲
-                        self._random_delay()
-                        
-                    except Exception as e:
-                        stats['failed'] += 1
-                        self.logger.error(f"處理新聞時發生錯誤: {e}")
-                
-                # 頁面統計日誌
-                if page_new_news > 0:
-                    self.logger.info(f"第 {page} 頁新增 {page_new_news} 條新新聞")
-                else:
-                    self.logger.info(f"第 {page} 頁沒有新增新聞")
-                
-            except Exception as e:
-                self.logger.error(f"處理第 {page} 頁時發生錯誤: {e}")
-                continue
-        
-        return self._finalize_scraping(stats, collected_news)
+        self.logger.info(f"開始爬取 {self.news_source} 新聞（只抓取當天）")
+        return super().scrape_news(max_pages, skip_existing, max_consecutive_duplicates)
 
     def _should_process_news(self, news_data: Dict[str, Any]) -> bool:
         """
@@ -265,16 +178,18 @@ class SETNScraper(BaseNewsScraper):
         
         return True
 
+    def _should_keep_news(self, news_data: Dict[str, Any]) -> bool:
+        """合併詳細頁面資料後再次檢查時間（雙重保險）"""
+        return self._should_process_news(news_data)
+
     def _is_today_news(self, publish_time_str: str) -> bool:
         """檢查新聞是否是當天的新聞"""
         try:
             # 解析發布時間
             if isinstance(publish_time_str, str):
-                # 嘗試解析標準格式 YYYY-MM-DD HH:MM:SS
-                if len(publish_time_str) >= 10:
-                    news_date = datetime.strptime(publish_time_str[:10], '%Y-%m-%d').date()
-                    today = datetime.now().date()
-                    return news_date == today
+                # 標準格式 YYYY-MM-DD HH:MM:SS，直接比較日期部分字串
+                if len(publish_time_str) >= 10 and publish_time_str[4] == '-' and publish_time_str[7] == '-':
+                    return publish_time_str[:10] == self.run_date_str
             return False
         except Exception as e:
             self.logger.debug(f"檢查日期失敗: {publish_time_str}, 錯誤: {e}")
@@ -287,16 +202,16 @@ class SETNScraper(BaseNewsScraper):
             if '/' in date_str and ':' in date_str:
                 # 加上當前年份
                 if date_str.count('/') == 1:  # MM/DD HH:MM 格式
-                    full_time = f"{self.current_year}/{date_str}"
+                    full_time = f"{self.run_time.year}/{date_str}"
                     dt = datetime.strptime(full_time, '%Y/%m/%d %H:%M')
                     
                     # 檢查是否是未來日期（超過當天）
-                    now = datetime.now()
+                    now = self.run_time
                     # 如果解析出的日期大於現在時間超過 1 天，可能是去年的新聞
                     if dt > now and (dt - now).days > 0:
                         # 嘗試使用上一年
                         try:
-                            prev_year = self.current_year - 1
+                            prev_year = self.run_time.year - 1
                             full_time_prev = f"{prev_year}/{date_str}"
                             dt_prev = datetime.strptime(full_time_prev, '%Y/%m/%d %H:%M')
                             self.logger.debug(f"日期 {date_str} 可能是未來日期，調整為去年: {dt_prev}")
@@ -330,16 +245,9 @@ class SETNScraper(BaseNewsScraper):
     def _extract_detail_publish_time(self, soup: BeautifulSoup) -> Optional[str]:
         """從詳細頁面提取發布時間"""
         try:
-            # 尋找時間相關標籤
-            time_selectors = [
-                'time.news-flash-date',
-                'time[datetime]',
-                '.publish-time',
-                '.news-time'
-            ]
-            
-            for selector in time_selectors:
-                time_elem = soup.select_one(selector)
+            # 依序尋找時間相關標籤
+            for selector in self._SELECTORS['detail_time']:
+                time_elem = selector.select_one(soup)
                 if time_elem:
                     time_text = time_elem.get_text(strip=True)
                     if time_text:
@@ -371,16 +279,7 @@ class SETNScraper(BaseNewsScraper):
     
     def _extract_author_from_text(self, text: str) -> Optional[str]:
         """從文字中提取作者名稱"""
-        patterns = [
-            re.compile(r'記者(\S+)／\S+報導'),    # "記者陳怡潔／台北報導"
-            re.compile(r'政治中心／(\S+)報導'),     # "政治中心／張家寧報導"
-            re.compile(r'文、圖／(\S+)'),         # "文、圖／鏡週刊"
-            re.compile(r'圖、文／(\S+)'),         # "圖、文／鏡週刊"
-            re.compile(r'文／(\S+)'),            # "文／記者名"
-            re.compile(r'文／\S+／(\S+)'),        # "文／住展雜誌／陳曼羚"
-        ]
-        
-        for pattern in patterns:
+        for pattern in _AUTHOR_PATTERNS:
             match = pattern.search(text)
             if match:
                 return match.group(1)
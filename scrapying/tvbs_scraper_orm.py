@@ -5,13 +5,10 @@ TVBS新聞爬蟲 - 使用ORM架構
 
 import sys
 import os
-import json
-import aiohttp
-import asyncio
 import pytz
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin
 
 # 添加根目錄到Python路徑
@@ -22,72 +19,47 @@ from .base_scraper_orm import BaseNewsScraper
 class TVBSScraper(BaseNewsScraper):
     """TVBS新聞爬蟲 - 使用ORM版本，基於舊版API邏輯"""
     
+    # 詳細頁面只需標題、作者區塊與 404 標記，其餘元素不建立樹
+    _DETAIL_STRAINER = SoupStrainer(class_=['title', 'author', 'error_div'])
+    
+    # is_today_news 無法直接比較字串時依序嘗試的日期格式
+    _DATE_FORMATS = ("%Y/%m/%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S")
+    
     def __init__(self):
         super().__init__(
             base_url="https://news.tvbs.com.tw/politics",
             news_source="TVBS",
             max_retry=3
         )
-        self.api_url = "https://news.tvbs.com.tw/news/get_breaking_news_other_cate"
-        self.current_payload = None
         self.taipei_tz = pytz.timezone('Asia/Taipei')
         self.today = datetime.now(self.taipei_tz).date()  # 改為當天
+        self.today_str = self.today.isoformat()  # YYYY-MM-DD，供日期字串直接比較
     
     def is_today_news(self, date_str: str) -> bool:
         """檢查給定的日期字串是否為今天的新聞"""
-        try:
-            # 嘗試多種日期格式
-            date_formats = [
-                "%Y/%m/%d %H:%M",      # TVBS 新聞詳情頁格式: 2023/03/07 11:39
-                "%Y-%m-%d %H:%M:%S",   # API 回傳格式: 2025-08-27 09:46:13
-                "%Y/%m/%d %H:%M:%S"    # 有秒數的格式
-            ]
-            
-            news_date = None
-            for date_format in date_formats:
-                try:
-                    news_date = datetime.strptime(date_str, date_format)
-                    break
-                except ValueError:
-                    continue
-            
-            if news_date is None:
-                self.logger.warning(f"無法解析日期格式: {date_str}")
-                return False
-                
-            # 只比較日期，不比較時間
-            return news_date.date() == self.today
-            
-        except Exception as e:
-            # 如果無法解析日期，回傳 False 以停止抓取
-            self.logger.warning(f"日期檢查出錯: {date_str}, 錯誤: {e}")
+        if not isinstance(date_str, str):
+            self.logger.warning(f"無法解析日期格式: {date_str}")
             return False
-    
-    
-    def _extract_payload_from_soup(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """從HTML中提取payload參數，基於舊版邏輯"""
-        try:
-            inputs = soup.select('div.container.politics input')
-            payload = {}
-            
-            for input_element in inputs:
-                if input_element.has_attr('value') and input_element.has_attr('id'):
-                    payload[input_element['id']] = input_element['value']
-            
-            return payload
-        except Exception as e:
-            self.logger.error(f"提取payload失敗: {e}")
-            return {}
-    
-    def _transform_payload(self, payload: Dict[str, str]) -> Dict[str, str]:
-        """轉換payload格式，基於舊版邏輯"""
-        return {
-            'news_id': payload.get('last_news_id', ''),
-            'page': payload.get('breaking_news_page', '2'),
-            'date': payload.get('last_news_review_date', ''),
-            'cate': payload.get('breaking_news_cate', '7'),
-            'get_num': payload.get('breaking_news_get_num', '90')
-        }
+        
+        # 常見格式的日期部分都是補零的前 10 個字元，直接比較字串：
+        #   2023/03/07 11:39      (TVBS 新聞詳情頁格式)
+        #   2025-08-27 09:46:13   (API 回傳格式)
+        #   2023/03/07 11:39:00   (有秒數的格式)
+        if (len(date_str) >= 16 and date_str[10] == ' '
+                and date_str[4] == date_str[7] and date_str[4] in '/-'):
+            # 只比較日期，不比較時間
+            return date_str[:10].replace('/', '-') == self.today_str
+        
+        # 其他寫法（例如月、日未補零）再以 strptime 逐一嘗試格式
+        for date_format in self._DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, date_format).date() == self.today
+            except ValueError:
+                continue
+        
+        # 如果無法解析日期，回傳 False 以停止抓取
+        self.logger.warning(f"無法解析日期格式: {date_str}")
+        return False
     
     def _get_news_list(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
         """從主頁面獲取新聞列表，基於舊版邏輯"""
@@ -103,7 +75,8 @@ class TVBSScraper(BaseNewsScraper):
                 if href and isinstance(href, str) and "/politics/" in href:
                     href_values.append(href)
             
-            for href in href_values:
+            # 同一連結在頁面上可能出現多次，保留首次出現的順序去重
+            for href in dict.fromkeys(href_values):
                 if href:
                     # 確保是完整URL
                     if not href.startswith('http'):
@@ -122,68 +95,15 @@ class TVBSScraper(BaseNewsScraper):
                     }
                     news_list.append(news_info)
             
-            # 2. 提取payload用於API調用
-            payload = self._extract_payload_from_soup(soup)
-            self.current_payload = self._transform_payload(payload)
-            
             return news_list
             
         except Exception as e:
             self.logger.error(f"解析新聞列表失敗: {e}")
             return []
     
-    async def _get_additional_news_from_api(self) -> List[Dict[str, str]]:
-        """使用API獲取更多新聞，基於舊版邏輯"""
-        try:
-            if not self.current_payload:
-                return []
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.api_url, params=self.current_payload) as response:
-                    if response.status == 200:
-                        api_data = await response.json()
-                        
-                        if 'breaking_news_other' in api_data:
-                            # 解析API返回的HTML
-                            api_soup = BeautifulSoup(api_data['breaking_news_other'], 'html.parser')
-                            
-                            # 提取新聞連結
-                            links = api_soup.find_all('a', href=True)
-                            href_values = []
-                            
-                            for a in links:
-                                href = a.get('href')
-                                if href and isinstance(href, str) and "/politics/" in href:
-                                    href_values.append(href)
-                            
-                            news_list = []
-                            for href in href_values:
-                                if href:
-                                    if not href.startswith('http'):
-                                        url = urljoin("https://news.tvbs.com.tw", href)
-                                    else:
-                                        url = href
-                                    
-                                    news_id = href.split('/')[-1] if '/' in href else href
-                                    
-                                    news_info = {
-                                        "title": "",
-                                        "url": url,
-                                        "news_id": news_id,
-                                        "publish_time": ""
-                                    }
-                                    news_list.append(news_info)
-                            
-                            return news_list
-            
-            return []
-        except Exception as e:
-            self.logger.error(f"API調用失敗: {e}")
-            return []
-    
     def _get_news_detail(self, news_url: str) -> Optional[Dict[str, Any]]:
         """獲取新聞詳細內容，基於舊版的 extract_details_from_html 邏輯"""
-        soup = self._get_page_content(news_url)
+        soup = self._get_page_content(news_url, parse_only=self._DETAIL_STRAINER)
         if not soup:
             return None
         
@@ -230,9 +150,9 @@ class TVBSScraper(BaseNewsScraper):
             if len(parts) > 0 and parts[-1].isdigit():
                 return parts[-1]
             else:
-                return str(hash(news_url))
+                return self._fallback_news_id(news_url)
         except:
-            return str(hash(news_url))
+            return self._fallback_news_id(news_url)
     
     def _convert_to_db_format(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
         """轉換為資料庫格式"""
@@ -248,7 +168,7 @@ class TVBSScraper(BaseNewsScraper):
         """統一日期格式，基於舊版邏輯"""
         try:
             if not date_str:
-                return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                return self.run_time_str
             
             if '/' in date_str:
                 # 處理 "2025/08/26 15:30" 格式
@@ -263,7 +183,7 @@ class TVBSScraper(BaseNewsScraper):
             return date_str
         except Exception as e:
             self.logger.warning(f"日期格式化失敗: {date_str}, 錯誤: {e}")
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return self.run_time_str
     
     def _should_process_news(self, news_data: Dict[str, Any]) -> bool:
         """
@@ -282,135 +202,6 @@ class TVBSScraper(BaseNewsScraper):
         self.logger.info(f"開始爬取 {self.news_source} 新聞，限制在今天 ({self.today}) 內")
         # 調用基類方法，基類已經包含連續重複檢查邏輯
         return super().scrape_news(max_pages, skip_existing, max_consecutive_duplicates)
-        
-        try:
-            # 1. 首先獲取主頁面
-            main_soup = self._get_page_content(self.base_url)
-            if not main_soup:
-                self.logger.error("無法獲取主頁面")
-                return stats
-            
-            # 2. 提取初始新聞列表
-            initial_news = self._get_news_list(main_soup)
-            all_hrefs = set()
-            
-            # 收集初始新聞連結
-            for news in initial_news:
-                if news.get('url'):
-                    href = news['url'].replace("https://news.tvbs.com.tw", "")
-                    all_hrefs.add(href)
-            
-            # 3. 使用API獲取更多新聞（基於舊版邏輯）
-            if self.current_payload:
-                date_str = self.current_payload.get('date', '')
-                
-                # 使用 while 循環檢查時間，但改為檢查今天的新聞
-                while self.is_today_news(date_str):
-                    self.logger.info(f"正在獲取更多新聞，當前日期: {date_str}")
-                    
-                    try:
-                        # 使用同步版本的 API 調用
-                        response = self.session.get(self.api_url, params=self.current_payload)
-                        if response.status_code == 200:
-                            api_data = response.json()
-                            
-                            if 'breaking_news_other' in api_data:
-                                # 解析新聞連結
-                                api_soup = BeautifulSoup(api_data['breaking_news_other'], 'html.parser')
-                                links = api_soup.find_all('a', href=True)
-                                
-                                for a in links:
-                                    href = a.get('href')
-                                    if href and isinstance(href, str) and "/politics/" in href:
-                                        all_hrefs.add(href)
-                                
-                                # 更新 payload（基於舊版邏輯）
-                                if 'last_news_id' in api_data:
-                                    self.current_payload['news_id'] = api_data['last_news_id']
-                                if 'last_news_review_date' in api_data:
-                                    date_str = api_data['last_news_review_date']
-                                    self.current_payload['date'] = date_str
-                                if 'page' in api_data:
-                                    self.current_payload['page'] = str(int(api_data['page']) + 1)
-                            else:
-                                self.logger.info("API 沒有更多新聞")
-                                break
-                        else:
-                            self.logger.error(f"API 請求失敗: {response.status_code}")
-                            break
-                            
-                        # 避免請求過於頻繁
-                        self._random_delay()
-                        
-                    except Exception as e:
-                        self.logger.error(f"API 請求失敗: {e}")
-                        break
-            
-            self.logger.info(f"總共收集到 {len(all_hrefs)} 個新聞連結")
-            
-            # 4. 處理所有收集到的新聞連結
-            for href in all_hrefs:
-                stats['total'] += 1
-                
-                try:
-                    news_url = f"https://news.tvbs.com.tw{href}"
-                    news_id = self._extract_news_id(news_url)
-                    
-                    # 檢查是否已存在
-                    if skip_existing and self._is_news_exists(news_id):
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # 獲取新聞詳情
-                    news_detail = self._get_news_detail(news_url)
-                    if not news_detail:
-                        stats['failed'] += 1
-                        continue
-                    
-                    # 檢查新聞發布時間是否為今天（就像其他爬蟲一樣）
-                    publish_time_str = news_detail.get('publish_time', '')
-                    if publish_time_str and not self.is_today_news(publish_time_str):
-                        self.logger.info(f"新聞時間不是今天，跳過: {publish_time_str}")
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # 準備新聞資料
-                    merged_data = {
-                        'url': news_url,
-                        'news_id': news_id,
-                        'source': self.news_source,
-                        **news_detail
-                    }
-                    
-                    # 轉換為資料庫格式
-                    db_data = self._convert_to_db_format(merged_data)
-                    collected_news.append(db_data)
-                    
-                    self.logger.info(f"收集新聞: {news_detail.get('title', 'Unknown')[:50]}")
-                    
-                    # 隨機延遲
-                    self._random_delay()
-                    
-                except Exception as e:
-                    stats['failed'] += 1
-                    self.logger.error(f"處理新聞時發生錯誤: {e}")
-            
-            # 5. 批量插入收集到的新聞
-            if collected_news:
-                self.logger.info(f"開始批量插入 {len(collected_news)} 條新聞到資料庫")
-                try:
-                    inserted_count = self.db.insert_news_batch(collected_news)
-                    stats['new'] = inserted_count
-                    self.logger.info(f"批量插入完成 - 成功插入 {inserted_count} 條新聞")
-                except Exception as e:
-                    self.logger.error(f"批量插入失敗: {e}")
-                    stats['failed'] += len(collected_news)
-            
-        except Exception as e:
-            self.logger.error(f"爬取過程中發生錯誤: {e}")
-        
-        self.logger.info(f"爬取完成 - 總計: {stats['total']}, 新增: {stats['new']}, 跳過: {stats['skipped']}, 失敗: {stats['failed']}")
-        return stats
 
 
 def test_tvbs_scraper():
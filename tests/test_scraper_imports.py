@@ -0,0 +1,34 @@
+"""
+爬蟲模組匯入測試
+確認鎖定版本的相依套件下每個爬蟲模組都能匯入 (不連線、不建立資料庫)
+"""
+
+import importlib
+import unittest
+
+SCRAPER_MODULES = (
+    'scrapying.base_scraper_orm',
+    'scrapying.setn_new',
+    'scrapying.ltn_scraper_orm',
+    'scrapying.tvbs_scraper_orm',
+    'scrapying.chinatimes_scraper_orm',
+)
+
+
+class ScraperImportTest(unittest.TestCase):
+    """每個爬蟲模組與 scrapying 套件匯出的類別皆可匯入"""
+    
+    def test_import_scraper_modules(self):
+        for module_name in SCRAPER_MODULES:
+            with self.subTest(module=module_name):
+                importlib.import_module(module_name)
+    
+    def test_package_exports(self):
+        scrapying = importlib.import_module('scrapying')
+        for name in scrapying.__all__:
+            with self.subTest(name=name):
+                self.assertTrue(isinstance(getattr(scrapying, name), type))
+
+
+if __name__ == '__main__':
+    unittest.main()